@@ -1,5 +1,83 @@
 from cvc5 import Kind
-import math
+from collections import OrderedDict
+import copy
+import functools
+
+
+INT_SORT = ("Int",)
+
+# Color constraints saved per solver memo, least recently used entries are dropped first.
+CONSTRAINTS_MEMO_SIZE = 8
+
+
+def vertex_name(v):
+    """
+    Get the symbol name of a vertex.
+
+    Args:
+        v: A graph node.
+
+    Returns:
+        str: The symbol name "v_<node>".
+    """
+    return "v_%s" % (v,)
+
+
+def new_solver_memo():
+    """
+    Create an empty memo for the colorers of one solver.
+
+    Terms are bound to the solver that created them, so a memo must only be
+    shared by colorers of the same solver (see reduction.create_cvc5, which
+    keeps the memo of a pooled solver with the solver).
+
+    Returns:
+        dict: Maps "sorts" to the sorts by descriptor (see ColorerCVC5.cached_sort) and
+              "constraints" to the saved color constraints (see memoize_constraints).
+    """
+    return {"sorts": {}, "constraints": OrderedDict()}
+
+
+def memoize_constraints(create_color_constraints):
+    """
+    Decorator that saves the result of create_color_constraints in the solver memo of the colorer.
+
+    The key is (colorer type, number of colors, nodes, isolated nodes). On a hit the saved
+    constraints and symbols are copied to the instance instead of being rebuilt. A pooled
+    solver pops the assertions of every encoding, but its terms stay valid, so the next
+    encoding of the same nodes on that solver reuses them.
+
+    Args:
+        create_color_constraints: The create_color_constraints method of a colorer.
+
+    Returns:
+        function: The memoized method.
+    """
+    @functools.wraps(create_color_constraints)
+    def wrapper(self, nodes):
+        # If already created then return member color_constraints.
+        if self.color_constraints:
+            return self.color_constraints
+
+        nodes = list(nodes)     # used by the key and by the method
+        saved = self.memo["constraints"]
+        key = (type(self), self.num_colors, frozenset(nodes), self.isolated_nodes)
+        entry = saved.get(key)
+        if entry is not None:
+            saved.move_to_end(key)
+            for name, value in entry.items():
+                setattr(self, name, copy.copy(value))
+            return self.color_constraints
+
+        constraints = create_color_constraints(self, nodes)
+
+        # Save copies, since the graph encoder extends the returned list with edge constraints.
+        saved[key] = {name: copy.copy(getattr(self, name)) for name in self.memo_attributes}
+        if len(saved) > CONSTRAINTS_MEMO_SIZE:
+            saved.popitem(last=False)
+        return constraints
+
+    return wrapper
 
 
 class ColorerCVC5:
@@ -14,19 +92,66 @@ class ColorerCVC5:
         vertex_symbols (dict): A dictionary mapping graph vertices to their corresponding SMT symbols.
         solver: The CVC5 solver instance.
         color_constraints (list): A list to store the color constraints.
+        int_sort: The integer sort of the solver, shared by the colorers of the solver.
+        isolated_nodes (frozenset): Nodes without edges, they get a fixed color and no constraints.
+        memo (dict): The memo of the solver, see new_solver_memo.
+        memo_attributes (tuple): Names of the attributes saved by memoize_constraints.
     """
-    def __init__(self, num_colors, solver):
+    memo_attributes = ("color_constraints", "vertex_symbols")
+
+    def __init__(self, num_colors, solver, memo = None):
         """
         Initialize the ColorerCVC5 instance.
 
         Args:
             num_colors (int): The number of colors to use for graph coloring.
             solver: The CVC5 solver instance.
+            memo (dict): The memo shared by the colorers of the solver (see new_solver_memo).
+                         Defaults to None, a new memo of this colorer only.
         """
         self.num_colors = num_colors
         self.vertex_symbols = {}
         self.solver = solver
         self.color_constraints = []
+        self.memo = new_solver_memo() if memo is None else memo
+        self.int_sort = self.cached_sort(INT_SORT)
+        self.isolated_nodes = frozenset()
+
+    def cached_sort(self, descriptor):
+        """
+        Get a sort of the solver, creating it only once per solver memo.
+
+        Colorers on a pooled solver share its memo, so they share its sorts too.
+
+        Args:
+            descriptor (tuple): One of INT_SORT, ("BitVec", width), ("Array", index descriptor,
+                                element descriptor) or ("Set", element descriptor).
+
+        Returns:
+            cvc5.Sort: The sort.
+
+        Raises:
+            ValueError: If the descriptor is unknown.
+        """
+        sorts = self.memo["sorts"]
+        sort = sorts.get(descriptor)
+        if sort is not None:
+            return sort
+
+        kind = descriptor[0]
+        if kind == "Int":
+            sort = self.solver.getIntegerSort()
+        elif kind == "BitVec":
+            sort = self.solver.mkBitVectorSort(descriptor[1])
+        elif kind == "Array":
+            sort = self.solver.mkArraySort(self.cached_sort(descriptor[1]), self.cached_sort(descriptor[2]))
+        elif kind == "Set":
+            sort = self.solver.mkSetSort(self.cached_sort(descriptor[1]))
+        else:
+            raise ValueError(f"Unknown sort descriptor {descriptor}")
+
+        sorts[descriptor] = sort
+        return sort
         
     def create_color_constraints(self, nodes):
         """
@@ -46,6 +171,40 @@ class ColorerCVC5:
         """
         raise NotImplementedError("This method should be overridden by subclasses")
 
+    def set_isolated_nodes(self, nodes):
+        """
+        Set the nodes without edges. Their vertex symbol is a fixed color
+        (see isolated_color), since no edge constraint uses them.
+
+        Args:
+            nodes: An iterable of graph nodes.
+        """
+        self.isolated_nodes = frozenset(nodes)
+
+    def isolated_color(self):
+        """
+        Get the fixed color term of isolated nodes.
+
+        Returns:
+            cvc5.Term: A value of the vertex sort.
+
+        Raises:
+            NotImplementedError: This method must be implemented by subclasses.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses")
+
+    def first_color(self):
+        """
+        Get one fixed color of the encoding, used for symmetry breaking.
+
+        Every encoding is symmetric under permutations of its colors, so any one
+        vertex can be fixed to this color. It is the color of isolated nodes.
+
+        Returns:
+            cvc5.Term: A value of the vertex sort.
+        """
+        return self.isolated_color()
+
     def get_vertex_symbols(self):
         """
         Get the dictionary of vertex symbols.
@@ -55,6 +214,20 @@ class ColorerCVC5:
         """
         return self.vertex_symbols
 
+    def group_constraints(self, constraints):
+        """
+        Group the color constraints of a formula by vertex, for display.
+
+        Colorers that emit several assertions per vertex override this method.
+
+        Args:
+            constraints (list): The formula constraints, color constraints first.
+
+        Returns:
+            list: The constraints, with one color constraint term per vertex.
+        """
+        return constraints
+
 
 
 
@@ -69,68 +242,190 @@ class LIAColorerCVC5(ColorerCVC5):
 
     Formula: Forall vi in V: 0 <= vi <= k-1
     """
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the integer 0.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkInteger(0)
+
+    @memoize_constraints
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Linear Integer Arithmetic.
 
+        The two bounds of each vertex are separate assertions, without an AND
+        term that the solver would flatten anyway.
+
         Args:
             nodes: An iterable of graph nodes.
 
         Returns:
-            list: A list of CVC5 terms representing the color constraints.
+            list: A list of CVC5 terms representing the color constraints, two per vertex.
         """
+        # Theory constants are created once and reused for all vertices.
+        int_sort = self.int_sort
+        zero = self.solver.mkInteger(0)
+        km1 = self.solver.mkInteger(self.num_colors - 1)
 
-       # If already created then return member color_constraints.
-        if self.color_constraints:
-            return self.color_constraints
-        
         for v in nodes:
-            vertex = self.solver.mkConst(self.solver.getIntegerSort(), f"v_{v}")
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            vertex = self.solver.mkConst(int_sort, vertex_name(v))
             self.vertex_symbols[v] = vertex         # save symbol for edge constraints creation and solution computation.
 
-
-            constraint = self.solver.mkTerm(
-                Kind.AND,
-                self.solver.mkTerm(Kind.GEQ, vertex, self.solver.mkInteger(0)),
-                self.solver.mkTerm(Kind.LEQ, vertex, self.solver.mkInteger(self.num_colors - 1))
-            )
-            self.color_constraints.append(constraint)
+            self.color_constraints.append(self.solver.mkTerm(Kind.GEQ, vertex, zero))
+            self.color_constraints.append(self.solver.mkTerm(Kind.LEQ, vertex, km1))
 
         return self.color_constraints
 
+    def group_constraints(self, constraints):
+        """
+        Group the two bounds of each vertex into one AND term, for display.
+
+        Args:
+            constraints (list): The formula constraints, color constraints first.
+
+        Returns:
+            list: The constraints, with one (0 <= vi <= k-1) term per vertex.
+        """
+        # Isolated nodes have a vertex symbol but no bounds, see create_color_constraints.
+        n = len(self.color_constraints)
+        grouped = [self.solver.mkTerm(Kind.AND, constraints[i], constraints[i + 1])
+                   for i in range(0, n, 2)]
+        return grouped + constraints[n:]
+
 
 
 class NLAColorerCVC5(ColorerCVC5):
     """
     Non-Linear Arithmetic (NLA) colorer for CVC5.
 
+    The polynomial vi(vi-1)...(vi-(k-1)) = 0 has exactly the roots 0,...,k-1, so
+    it is asserted in its equivalent form as a disjunction of equalities. This
+    keeps the formula in linear arithmetic, which cvc5 decides far faster than
+    its incomplete non-linear solver. See ProductNLAColorerCVC5 for the product form.
+
+    Formula: Forall vi in V: vi = 0 or vi = 1 or ... or vi = k-1
+    """
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the integer 0.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkInteger(0)
+
+    @memoize_constraints
+    def create_color_constraints(self, nodes):
+        """
+        Create color constraints as a disjunction of equalities for each vertex.
+
+        Args:
+            nodes: An iterable of graph nodes.
+
+        Returns:
+            list: A list of CVC5 terms representing the color constraints.
+        """
+        # Theory constants are created once and reused for all vertices.
+        int_sort = self.int_sort
+        ints = [self.solver.mkInteger(i) for i in range(self.num_colors)]
+
+        for v in nodes:
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            vertex = self.solver.mkConst(int_sort, vertex_name(v))
+            self.vertex_symbols[v] = vertex # save symbol for edge constraints creation and solution computation.
+
+            # create (vi = i) for each i in range
+            eqs = [self.solver.mkTerm(Kind.EQUAL, vertex, c) for c in ints]
+
+            # OR needs at least two arguments.
+            self.color_constraints.append(
+                self.solver.mkTerm(Kind.OR, *eqs) if len(eqs) > 1 else eqs[0])
+            
+        return self.color_constraints
+
+
+
+class ProductNLAColorerCVC5(ColorerCVC5):
+    """
+    Non-Linear Arithmetic colorer for CVC5 with the product formula.
+
     This class implements a graph coloring strategy using Non-Linear Arithmetic.
     The coloring constraint ensures that the product of the differences between
-    each vertex value and the possible color values is zero.
+    each vertex value and the possible color values is zero. It keeps the
+    polynomial, for benchmarking the non-linear solver.
 
     Formula: Forall vi in V: vi(vi-1)...(vi-(k-1)) = 0
     """
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the integer 0.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkInteger(0)
+
+    def balanced_mult(self, terms):
+        """
+        Multiply terms as a balanced binary tree of MULT terms.
+
+        A balanced tree has depth log2(k) instead of the depth k of one variadic product.
+
+        Args:
+            terms (list): A non-empty list of CVC5 integer terms.
+
+        Returns:
+            cvc5.Term: The product of the terms.
+        """
+        while len(terms) > 1:
+            paired = [self.solver.mkTerm(Kind.MULT, a, b) for a, b in zip(terms[::2], terms[1::2])]
+            if len(terms) % 2:
+                paired.append(terms[-1])
+            terms = paired
+        return terms[0]
+
+    @memoize_constraints
     def create_color_constraints(self, nodes):
-        # If already created then return member color_constraints.
-        if self.color_constraints :
-            return self.color_constraints
-        
+        """
+        Create color constraints as a product of differences for each vertex.
+
+        Args:
+            nodes: An iterable of graph nodes.
+
+        Returns:
+            list: A list of CVC5 terms representing the color constraints.
+        """
+        # Theory constants are created once and reused for all vertices.
+        int_sort = self.int_sort
+        ints = [self.solver.mkInteger(i) for i in range(self.num_colors)]
+
         for v in nodes:
-            vertex = self.solver.mkConst(self.solver.getIntegerSort(), f"v_{v}")
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            vertex = self.solver.mkConst(int_sort, vertex_name(v))
             self.vertex_symbols[v] = vertex # save symbol for edge constraints creation and solution computation.
             
             # create (vi-i) for each i in range
             colorer_vi = []
             for i in range(self.num_colors):
                 colorer_vi.append(
-                    self.solver.mkTerm(Kind.SUB, vertex, self.solver.mkInteger(i)))
+                    self.solver.mkTerm(Kind.SUB, vertex, ints[i]))
                 
             # Muiltiply all constraints.
             self.color_constraints.append(
                 self.solver.mkTerm(
                     Kind.EQUAL,
-                    self.solver.mkTerm(Kind.MULT, *colorer_vi),
-                    self.solver.mkInteger(0)                  
+                    self.balanced_mult(colorer_vi),
+                    ints[0]
                     ))
             
         return self.color_constraints
@@ -138,12 +433,12 @@ class NLAColorerCVC5(ColorerCVC5):
 
 
 
-# Formula: For each v in V:
-#           A_0 = array
-#           A_1 = A_0[i_1 <- 0]
-#           ...
-#           A_k = A_(k-1)[i_(k-1) <- k-1]
-#           v = A_k[i_1]
+# Formula: A_0 = constant array of 0
+#          A_1 = A_0[i_1 <- 0]
+#          ...
+#          A_k = A_(k-1)[i_k <- k-1]
+#          For each v in V:
+#           v = A_k[i_v]
 
 class ArrayINTColorerCVC5(ColorerCVC5):
     """
@@ -152,14 +447,24 @@ class ArrayINTColorerCVC5(ColorerCVC5):
     This class implements a graph coloring strategy using Arrays with Integers.
     The coloring constraint uses a series of array operations to assign colors to vertices.
 
-    Formula: For each v in V:
-             A_0 = array
+    Formula: A_0 = constant array of 0
              A_1 = A_0[i_1 <- 0]
              ...
-             A_k = A_(k-1)[i_(k-1) <- k-1]
-             v = A_k[i_1]
+             A_k = A_(k-1)[i_k <- k-1]
+             For each v in V:
+                v = A_k[i_v]
     """
 
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the integer 0.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkInteger(0)
+
+    @memoize_constraints
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Arrays with Integers.
@@ -170,44 +475,43 @@ class ArrayINTColorerCVC5(ColorerCVC5):
         Returns:
             list: A list of CVC5 terms representing the color constraints.
         """
-        # If already created then return member color_constraints.
-        if self.color_constraints:
-            return self.color_constraints
-        
-        int_sort = self.solver.getIntegerSort()
-        array_sort = self.solver.mkArraySort(int_sort, int_sort)
+        int_sort = self.int_sort
+        array_sort = self.cached_sort(("Array", INT_SORT, INT_SORT))
+        int_values = [self.solver.mkInteger(i) for i in range(self.num_colors)]
+
+        # The size is known: k chain constraints and one constraint per connected vertex.
+        connected = sum(1 for v in nodes if v not in self.isolated_nodes)
+        constraints = [None] * (self.num_colors + connected)
+        pos = 0
+
+        # The array chain is shared by all vertices. The base array is constant 0,
+        # so every select on the last array is one of the colors.
+        prev_arr = self.solver.mkConstArray(array_sort, int_values[0])
+        for i in range(1, self.num_colors + 1):
+            # Create new variable, create new array using cur_arr = prev_arr[i <- i-1]
+            cur_i = self.solver.mkConst(int_sort, f"i{i}")
+            cur_arr = self.solver.mkConst(array_sort, f"arr{i}")
+            constraints[pos] = self.solver.mkTerm(Kind.EQUAL, cur_arr, 
+                          self.solver.mkTerm(Kind.STORE, prev_arr, cur_i, int_values[i-1]))
+            pos += 1
+            prev_arr = cur_arr
 
         for v in nodes:
-            # Create variable for this vertex
-            vertex = self.solver.mkConst(int_sort, f"v_{v}")
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            # Create variable and index for this vertex
+            name = vertex_name(v)
+            vertex = self.solver.mkConst(int_sort, name)
             self.vertex_symbols[v] = vertex  # save symbol for edge constraints creation and solution computation.
+            i_v = self.solver.mkConst(int_sort, "i_" + name)
 
-            # Create array for constraints of this vertex
-            ass_vi = []
-
-            # Create base array
-            arr1 = self.solver.mkConst(array_sort, f"arr0_v{v}")
-
-            # First iteration out of loop since we will need an i1, and this helps not to use if inside.
-            i1 = self.solver.mkConst(int_sort, f"i1_v{v}")
-            prev_arr = self.solver.mkConst(array_sort, f"arr1_v{v}")
-            ass_vi.append(self.solver.mkTerm(Kind.EQUAL, prev_arr, 
-                          self.solver.mkTerm(Kind.STORE, arr1, i1, self.solver.mkInteger(0))))
-
-            for i in range(2, self.num_colors + 1):
-                # Create new variable, create new array using cur_arr = prev_arr[i <- i]
-                cur_i = self.solver.mkConst(int_sort, f"i{i}_v{v}")
-                cur_arr = self.solver.mkConst(array_sort, f"arr{i}_v{v}")
-                ass_vi.append(self.solver.mkTerm(Kind.EQUAL, cur_arr, 
-                              self.solver.mkTerm(Kind.STORE, prev_arr, cur_i, self.solver.mkInteger(i-1))))
-                prev_arr = cur_arr
-
-            # Value of v1 is last array[i1]
-            ass_vi.append(self.solver.mkTerm(Kind.EQUAL, vertex, 
-                          self.solver.mkTerm(Kind.SELECT, prev_arr, i1)))
-
-            self.color_constraints.extend(ass_vi)
+            # Value of vertex is last array[i_v]
+            constraints[pos] = self.solver.mkTerm(Kind.EQUAL, vertex, 
+                          self.solver.mkTerm(Kind.SELECT, prev_arr, i_v))
+            pos += 1
 
+        self.color_constraints = constraints
         return self.color_constraints
     
 
@@ -219,14 +523,37 @@ class ArrayBVColorerCVC5(ColorerCVC5):
     This class implements a graph coloring strategy using Arrays with Bit-Vectors.
     The coloring constraint uses a series of array operations with bit-vectors to assign colors to vertices.
 
-    Formula: For each v in V:
-             A_0 = array
+    Formula: A_0 = constant array of 0
              A_1 = A_0[i_1 <- 0]
              ...
-             A_k = A_(k-1)[i_(k-1) <- k-1]
-             v = A_k[i_1]
+             A_k = A_(k-1)[i_k <- k-1]
+             For each v in V:
+                v = A_k[i_v]
     """
 
+    def __init__(self, num_colors, solver, memo = None):
+        """
+        Initialize the ArrayBVColorerCVC5 instance.
+
+        Args:
+            num_colors (int): The number of colors to use for graph coloring.
+            solver: The CVC5 solver instance.
+            memo (dict): The memo of the solver, see ColorerCVC5. Defaults to None.
+        """
+        super().__init__(num_colors, solver, memo)
+        self.bv_width = (num_colors - 1).bit_length()   # ceil(log2(k))
+        self.bv_sort = self.cached_sort(("BitVec", self.bv_width))
+
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the zero bit-vector.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkBitVector(self.bv_width, 0)
+
+    @memoize_constraints
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Arrays with Bit-Vectors.
@@ -237,44 +564,41 @@ class ArrayBVColorerCVC5(ColorerCVC5):
         Returns:
             list: A list of CVC5 terms representing the color constraints.
         """
-        # If already created then return member color_constraints.
-        if self.color_constraints:
-            return self.color_constraints
-        
-        num_bits = math.ceil(math.log2(self.num_colors))
-        bv_sort = self.solver.mkBitVectorSort(num_bits)
-        array_sort = self.solver.mkArraySort(bv_sort, bv_sort)
+        bv_sort = self.bv_sort
+        array_sort = self.cached_sort(("Array", ("BitVec", self.bv_width), ("BitVec", self.bv_width)))
+        bv_values = [self.solver.mkBitVector(self.bv_width, i) for i in range(self.num_colors)]
 
-        for v in nodes:
-            # Create variable for this vertex
-            vertex = self.solver.mkConst(bv_sort, f"v_{v}")
-            self.vertex_symbols[v] = vertex  # save symbol for edge constraints creation and solution computation.
+        # The size is known: k chain constraints and one constraint per connected vertex.
+        connected = sum(1 for v in nodes if v not in self.isolated_nodes)
+        constraints = [None] * (self.num_colors + connected)
+        pos = 0
 
-            # Create array for constraints of this vertex
-            ass_vi = []
-
-            # Create base array
-            arr1 = self.solver.mkConst(array_sort, f"arr0_v{v}")
-
-            # First iteration out of loop
-            i1 = self.solver.mkConst(bv_sort, f"i1_v{v}")
-            prev_arr = self.solver.mkConst(array_sort, f"arr1_v{v}")
-            ass_vi.append(self.solver.mkTerm(Kind.EQUAL, prev_arr, 
-                          self.solver.mkTerm(Kind.STORE, arr1, i1, self.solver.mkBitVector(num_bits, 0))))
-
-            for i in range(2, self.num_colors + 1):
-                cur_i = self.solver.mkConst(bv_sort, f"i{i}_v{v}")
-                cur_arr = self.solver.mkConst(array_sort, f"arr{i}_v{v}")
-                ass_vi.append(self.solver.mkTerm(Kind.EQUAL, cur_arr, 
-                              self.solver.mkTerm(Kind.STORE, prev_arr, cur_i, self.solver.mkBitVector(num_bits, i-1))))
-                prev_arr = cur_arr
+        # The array chain is shared by all vertices, the base array is constant 0.
+        prev_arr = self.solver.mkConstArray(array_sort, bv_values[0])
+        for i in range(1, self.num_colors + 1):
+            cur_i = self.solver.mkConst(bv_sort, f"i{i}")
+            cur_arr = self.solver.mkConst(array_sort, f"arr{i}")
+            constraints[pos] = self.solver.mkTerm(Kind.EQUAL, cur_arr, 
+                          self.solver.mkTerm(Kind.STORE, prev_arr, cur_i, bv_values[i-1]))
+            pos += 1
+            prev_arr = cur_arr
 
-            # Value of vertex is last array[i1]
-            ass_vi.append(self.solver.mkTerm(Kind.EQUAL, vertex, 
-                          self.solver.mkTerm(Kind.SELECT, prev_arr, i1)))
+        for v in nodes:
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            # Create variable and index for this vertex
+            name = vertex_name(v)
+            vertex = self.solver.mkConst(bv_sort, name)
+            self.vertex_symbols[v] = vertex  # save symbol for edge constraints creation and solution computation.
+            i_v = self.solver.mkConst(bv_sort, "i_" + name)
 
-            self.color_constraints.extend(ass_vi)
+            # Value of vertex is last array[i_v]
+            constraints[pos] = self.solver.mkTerm(Kind.EQUAL, vertex, 
+                          self.solver.mkTerm(Kind.SELECT, prev_arr, i_v))
+            pos += 1
 
+        self.color_constraints = constraints
         return self.color_constraints
 
     
@@ -286,23 +610,26 @@ class ArrayUFColorerCVC5(ColorerCVC5):
     This class implements a graph coloring strategy using Arrays with Uninterpreted Functions.
     It creates distinct color symbols and uses array operations to assign these colors to vertices.
 
-    Formula: For each v in V:
-             A_0 = array
-             A_1 = A_0[i_1 <- 0]
+    Formula: A_0 = array
+             A_1 = A_0[i_1 <- c_1]
              ...
-             A_k = A_(k-1)[i_(k-1) <- k-1]
-             v = A_k[i_1]
+             A_k = A_(k-1)[i_k <- c_k]
+             For each v in V:
+                i_v in {i_1,...,i_k}
+                v = A_k[i_v]
     """
+    memo_attributes = ColorerCVC5.memo_attributes + ("color_symbols",)
 
-    def __init__(self, num_colors, solver):
+    def __init__(self, num_colors, solver, memo = None):
         """
         Initialize the ArrayUFColorerCVC5 instance.
 
         Args:
             num_colors (int): The number of colors to use for graph coloring.
             solver: The CVC5 solver instance.
+            memo (dict): The memo of the solver, see ColorerCVC5. Defaults to None.
         """
-        super().__init__(num_colors, solver)
+        super().__init__(num_colors, solver, memo)
         self.color_symbols = {}
 
     def get_color_symbols(self):
@@ -314,6 +641,16 @@ class ArrayUFColorerCVC5(ColorerCVC5):
         """
         return self.color_symbols
 
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the color symbol c_1.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.color_symbols["c_1"]
+
+    @memoize_constraints
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Arrays with Uninterpreted Functions.
@@ -324,10 +661,6 @@ class ArrayUFColorerCVC5(ColorerCVC5):
         Returns:
             list: A list of CVC5 terms representing the color constraints.
         """
-        # If already created then return member color_constraints.
-        if self.color_constraints:
-            return self.color_constraints
-
         # Define sorts
         IndexType = self.solver.mkUninterpretedSort("IndexType")
         ElementType = self.solver.mkUninterpretedSort("ColorType")
@@ -337,48 +670,56 @@ class ArrayUFColorerCVC5(ColorerCVC5):
         for i in range(1, self.num_colors + 1):
             self.color_symbols[f"c_{i}"] = self.solver.mkConst(ElementType, f"c_{i}")
 
-        # Create constraints to ensure colors are different
-        for i in range(1, self.num_colors):
-            for j in range(i + 1, self.num_colors + 1):
-                self.color_constraints.append(
-                    self.solver.mkTerm(Kind.DISTINCT, 
-                                       self.color_symbols[f"c_{i}"], 
-                                       self.color_symbols[f"c_{j}"])
-                )
+        # Positional list of the color symbols, cs[i] is c_i (cs[0] is unused).
+        cs = [None] + [self.color_symbols[f"c_{i}"] for i in range(1, self.num_colors + 1)]
+
+        # The size is known: the DISTINCT constraint, k chain constraints and two
+        # constraints per connected vertex.
+        connected = sum(1 for v in nodes if v not in self.isolated_nodes)
+        constraints = [None] * ((self.num_colors > 1) + self.num_colors + 2 * connected)
+        pos = 0
+
+        # Create one n-ary constraint to ensure colors are different
+        # (DISTINCT needs at least two arguments).
+        if self.num_colors > 1:
+            constraints[pos] = self.solver.mkTerm(Kind.DISTINCT, *cs[1:])
+            pos += 1
+
+        # The array chain is shared by all vertices. Constant arrays need a value
+        # and the colors are symbols, so the base array is free and each vertex
+        # selects one of the stored indices instead.
+        prev_arr = self.solver.mkConst(ArrayType, "arr0")
+        indices = []
+        for i in range(1, self.num_colors + 1):
+            cur_i = self.solver.mkConst(IndexType, f"i{i}")
+            indices.append(cur_i)
+            cur_arr = self.solver.mkConst(ArrayType, f"arr{i}")
+            constraints[pos] = self.solver.mkTerm(Kind.EQUAL,
+                cur_arr,
+                self.solver.mkTerm(Kind.STORE, prev_arr, cur_i, cs[i])
+            )
+            pos += 1
+            prev_arr = cur_arr
 
         for v in nodes:
-            vertex = self.solver.mkConst(ElementType, f"v_{v}")
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            name = vertex_name(v)
+            vertex = self.solver.mkConst(ElementType, name)
             self.vertex_symbols[v] = vertex  # save symbol for edge constraints creation and solution computation.
+            i_v = self.solver.mkConst(IndexType, "i_" + name)
 
-            ass_vi = []
-            arr1 = self.solver.mkConst(ArrayType, f"arr0_v{v}")
-
-            i1 = self.solver.mkConst(IndexType, f"i1_v{v}")
-            prev_arr = self.solver.mkConst(ArrayType, f"arr1_v{v}")
-            ass_vi.append(
-                self.solver.mkTerm(Kind.EQUAL, 
-                                   prev_arr, 
-                                   self.solver.mkTerm(Kind.STORE, arr1, i1, self.color_symbols[f"c_1"]))
+            constraints[pos] = (
+                self.solver.mkTerm(Kind.OR, *[self.solver.mkTerm(Kind.EQUAL, i_v, i) for i in indices])
+                if len(indices) > 1 else self.solver.mkTerm(Kind.EQUAL, i_v, indices[0])
             )
+            constraints[pos + 1] = self.solver.mkTerm(Kind.EQUAL, 
+                                                      vertex, 
+                                                      self.solver.mkTerm(Kind.SELECT, prev_arr, i_v))
+            pos += 2
 
-            for i in range(2, self.num_colors + 1):
-                cur_i = self.solver.mkConst(IndexType, f"i{i}_v{v}")
-                cur_arr = self.solver.mkConst(ArrayType, f"arr{i}_v{v}")
-                ass_vi.append(
-                    self.solver.mkTerm(Kind.EQUAL,
-                        cur_arr,
-                        self.solver.mkTerm(Kind.STORE, prev_arr, cur_i, self.color_symbols[f"c_{i}"])
-                    )
-                )
-                prev_arr = cur_arr
-
-            ass_vi.append(
-                self.solver.mkTerm(Kind.EQUAL, 
-                                   vertex, 
-                                   self.solver.mkTerm(Kind.SELECT, prev_arr, i1))
-            )
-            self.color_constraints.extend(ass_vi)
-
+        self.color_constraints = constraints
         return self.color_constraints
 
 
@@ -399,20 +740,32 @@ class SetUFColorerCVC5(ColorerCVC5):
     Note: This colorer only works when the number of colors is a power of 2.
     """
 
-    def __init__(self, num_colors, solver):
+    def __init__(self, num_colors, solver, memo = None):
         """
         Initialize the SetUFColorerCVC5 instance.
 
         Args:
             num_colors (int): The number of colors to use for graph coloring. Must be a power of 2.
             solver: The CVC5 solver instance.
+            memo (dict): The memo of the solver, see ColorerCVC5. Defaults to None.
+
+        Raises:
+            ValueError: If the number of colors is not a power of 2.
         """
-        condition = (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0
-        if condition:
-            self.object = None
-        else:
-            super().__init__(num_colors, solver)
-            self.color_symbols = []
+        if (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0:
+            raise ValueError("num_colors must be a power of 2")
+        super().__init__(num_colors, solver, memo)
+        self.color_symbols = []
+        self.set_power = num_colors.bit_length() - 1    # log2(k)
+
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the empty set.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkEmptySet(self.solver.mkSetSort(self.color_sort))
 
     def create_color_constraints(self, nodes):
         """
@@ -428,10 +781,11 @@ class SetUFColorerCVC5(ColorerCVC5):
         if self.color_constraints:
             return self.color_constraints
         
-        set_power = int(math.log2(self.num_colors))
+        set_power = self.set_power
 
         # Create an uninterpreted sort for colors
         ElementType = self.solver.mkUninterpretedSort("ColorType")
+        self.color_sort = ElementType
         set_sort = self.solver.mkSetSort(ElementType)
 
         # Create color symbols
@@ -453,7 +807,10 @@ class SetUFColorerCVC5(ColorerCVC5):
 
         # For each node vi is subset of set_term
         for v in nodes:
-            vertex = self.solver.mkConst(set_sort, f"v_{v}")
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            vertex = self.solver.mkConst(set_sort, vertex_name(v))
             self.vertex_symbols[v] = vertex  # save symbol for edge constraints creation and solution computation.
 
             self.color_constraints.append(
@@ -479,19 +836,31 @@ class SetINTColorerCVC5(ColorerCVC5):
     Note: This colorer only works when the number of colors is a power of 2.
     """
 
-    def __init__(self, num_colors, solver):
+    def __init__(self, num_colors, solver, memo = None):
         """
         Initialize the SetINTColorerCVC5 instance.
 
         Args:
             num_colors (int): The number of colors to use for graph coloring. Must be a power of 2.
             solver: The CVC5 solver instance.
+            memo (dict): The memo of the solver, see ColorerCVC5. Defaults to None.
+
+        Raises:
+            ValueError: If the number of colors is not a power of 2.
         """
-        condition = (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0
-        if condition:
-            self.object = None
-        else:
-            super().__init__(num_colors, solver)
+        if (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0:
+            raise ValueError("num_colors must be a power of 2")
+        super().__init__(num_colors, solver, memo)
+        self.set_power = num_colors.bit_length() - 1    # log2(k)
+
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the empty set.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkEmptySet(self.cached_sort(("Set", INT_SORT)))
 
     def create_color_constraints(self, nodes):
         """
@@ -507,10 +876,9 @@ class SetINTColorerCVC5(ColorerCVC5):
         if self.color_constraints:
             return self.color_constraints
         
-        set_power = int(math.log2(self.num_colors))
+        set_power = self.set_power
 
-        int_sort = self.solver.getIntegerSort()
-        set_sort = self.solver.mkSetSort(int_sort)
+        set_sort = self.cached_sort(("Set", INT_SORT))
         
         # Create set with elements
         set_term = self.solver.mkEmptySet(set_sort)
@@ -519,7 +887,10 @@ class SetINTColorerCVC5(ColorerCVC5):
 
         # For each node vi is subset of set_term
         for v in nodes:
-            vertex = self.solver.mkConst(set_sort, f"v_{v}")
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            vertex = self.solver.mkConst(set_sort, vertex_name(v))
             self.vertex_symbols[v] = vertex  # save symbol for edge constraints creation and solution computation.
 
             self.color_constraints.append(
@@ -546,19 +917,33 @@ class SetBVColorerCVC5(ColorerCVC5):
     Note: This colorer only works when the number of colors is a power of 2.
     """
 
-    def __init__(self, num_colors, solver):
+    def __init__(self, num_colors, solver, memo = None):
         """
         Initialize the SetBVColorerCVC5 instance.
 
         Args:
             num_colors (int): The number of colors to use for graph coloring. Must be a power of 2.
             solver: The CVC5 solver instance.
+            memo (dict): The memo of the solver, see ColorerCVC5. Defaults to None.
+
+        Raises:
+            ValueError: If the number of colors is not a power of 2.
         """
-        condition = (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0
-        if condition:
-            self.object = None
-        else:
-            super().__init__(num_colors, solver)
+        if (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0:
+            raise ValueError("num_colors must be a power of 2")
+        super().__init__(num_colors, solver, memo)
+        self.bv_width = (num_colors - 1).bit_length()   # ceil(log2(k))
+        self.set_power = num_colors.bit_length() - 1    # log2(k)
+        self.bv_sort = self.cached_sort(("BitVec", self.bv_width))
+
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the empty set.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkEmptySet(self.cached_sort(("Set", ("BitVec", self.bv_width))))
 
     def create_color_constraints(self, nodes):
         """
@@ -574,11 +959,11 @@ class SetBVColorerCVC5(ColorerCVC5):
         if self.color_constraints:
             return self.color_constraints
         
-        bv_width = math.ceil(math.log2(self.num_colors))
-        set_power = int(math.log2(self.num_colors))
+        bv_width = self.bv_width
+        set_power = self.set_power
 
-        bv_sort = self.solver.mkBitVectorSort(bv_width)
-        set_sort = self.solver.mkSetSort(bv_sort)
+        bv_sort = self.bv_sort
+        set_sort = self.cached_sort(("Set", ("BitVec", bv_width)))
         
         # Create set with elements
         set_term = self.solver.mkEmptySet(set_sort)
@@ -587,7 +972,10 @@ class SetBVColorerCVC5(ColorerCVC5):
 
         # For each node vi is subset of set_term
         for v in nodes:
-            vertex = self.solver.mkConst(set_sort, f"v_{v}")
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            vertex = self.solver.mkConst(set_sort, vertex_name(v))
             self.vertex_symbols[v] = vertex  # save symbol for edge constraints creation and solution computation.
 
             self.color_constraints.append(
@@ -612,19 +1000,32 @@ class BVColorerCVC5(ColorerCVC5):
     Note: This colorer only works when the number of colors is a power of 2.
     """
 
-    def __init__(self, num_colors, solver):
+    def __init__(self, num_colors, solver, memo = None):
         """
         Initialize the BVColorerCVC5 instance.
 
         Args:
             num_colors (int): The number of colors to use for graph coloring. Must be a power of 2.
             solver: The CVC5 solver instance.
+            memo (dict): The memo of the solver, see ColorerCVC5. Defaults to None.
+
+        Raises:
+            ValueError: If the number of colors is not a power of 2.
         """
-        condition = (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0
-        if condition:
-            self.object = None
-        else:
-            super().__init__(num_colors, solver)
+        if (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0:
+            raise ValueError("num_colors must be a power of 2")
+        super().__init__(num_colors, solver, memo)
+        self.bv_width = num_colors.bit_length() - 1     # log2(k)
+        self.bv_sort = self.cached_sort(("BitVec", self.bv_width))
+
+    def isolated_color(self):
+        """
+        Get the fixed color of isolated nodes, the zero bit-vector.
+
+        Returns:
+            cvc5.Term: The color term.
+        """
+        return self.solver.mkBitVector(self.bv_width, 0)
 
     def create_color_constraints(self, nodes):
         """
@@ -643,12 +1044,14 @@ class BVColorerCVC5(ColorerCVC5):
             return []
         
 
-        bv_length = int(math.log2(self.num_colors))
-        bv_sort = self.solver.mkBitVectorSort(bv_length)
+        bv_sort = self.bv_sort
 
-        # Each v is BV with bv_length
+        # Each v is BV with bv_width
         for v in nodes:
-            vertex = self.solver.mkConst(bv_sort, f"v_{v}")
+            if v in self.isolated_nodes:
+                self.vertex_symbols[v] = self.isolated_color()     # no edge uses it, any color will do.
+                continue
+            vertex = self.solver.mkConst(bv_sort, vertex_name(v))
             self.vertex_symbols[v] = vertex  # save symbol for edge constraints creation and solution computation.
 
         return []
\ No newline at end of file
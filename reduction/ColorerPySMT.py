@@ -1,8 +1,37 @@
 from pysmt.shortcuts import (
-    Symbol, Int, And, LE, GE, Minus, Equals, Times, Store, Select, BV, Not
+    Symbol, Int, And, LE, GE, Minus, Equals, Times, Store, Select, BV, AllDifferent
 )
 from pysmt.typing import INT, ArrayType, BVType, Type
-import math
+
+
+def array_chain_constraint(v, vertex, arr_t, idx_t, values):
+    """
+    Create the array store chain that assigns one of the given values to a vertex.
+
+    The chain A_1 = A_0[i_1 <- values[0]], ..., A_k = A_(k-1)[i_k <- values[k-1]],
+    vertex = A_k[i_1] is emitted as the single constraint
+    vertex = Store(...Store(A_0, i_1, values[0])..., i_k, values[k-1])[i_1],
+    so only the base array A_0 and the indices are symbols. Symbol names are
+    built with %-formatting, since this loop dominates the build time.
+
+    Args:
+        v: The graph node.
+        vertex: The pySMT symbol of the vertex.
+        arr_t: The array type.
+        idx_t: The index type.
+        values (list): The k values to store, one per color.
+
+    Returns:
+        FNode: The pySMT formula of the chain.
+    """
+    _Symbol, _Store = Symbol, Store
+    idxs = [_Symbol("i%d_v%s" % (i, v), idx_t) for i in range(1, len(values) + 1)]
+
+    nested = _Symbol("arr0_v%s" % v, arr_t)
+    for idx, value in zip(idxs, values):
+        nested = _Store(nested, idx, value)
+    return Equals(vertex, Select(nested, idxs[0]))
+
 
 class ColorerPySMT:
     """
@@ -15,6 +44,7 @@ class ColorerPySMT:
         num_colors (int): The number of colors to use for graph coloring.
         vertex_symbols (dict): A dictionary mapping graph vertices to their corresponding pySMT symbols.
         color_constraints (list): A list to store the color constraints.
+        _int_const_cache (list): The integer constants Int(0) ... Int(k), shared by the subclasses.
     """
 
     def __init__(self, num_colors):
@@ -27,6 +57,7 @@ class ColorerPySMT:
         self.num_colors = num_colors
         self.vertex_symbols = {}      
         self.color_constraints = []
+        self._int_const_cache = [Int(i) for i in range(num_colors + 1)]
         
     def create_color_constraints(self, nodes):
         """
@@ -55,6 +86,18 @@ class ColorerPySMT:
         """
         return self.vertex_symbols
 
+    def first_color(self):
+        """
+        Get one fixed color of the encoding, used for symmetry breaking.
+
+        Every encoding is symmetric under permutations of its colors, so any one
+        vertex can be fixed to this color. The integer encodings use the color 0.
+
+        Returns:
+            FNode: A value of the vertex type.
+        """
+        return self._int_const_cache[0]
+
 
 class LIAColorerPySMT(ColorerPySMT):
     """
@@ -80,13 +123,13 @@ class LIAColorerPySMT(ColorerPySMT):
         if self.color_constraints:
             return self.color_constraints
         
-        for v in nodes:
-            vertex = Symbol(f"v_{v}", INT)
-            self.vertex_symbols[v] = vertex
-            self.color_constraints.append(
-                And(GE(vertex, Int(0)), LE(vertex, Int(self.num_colors - 1)))
-            )
-        
+        # The bounds are shared by all vertices.
+        zero = self._int_const_cache[0]
+        kmax = Int(self.num_colors - 1)
+
+        vertices = [(v, Symbol("v_%s" % v, INT)) for v in nodes]
+        self.vertex_symbols.update(vertices)
+        self.color_constraints.extend([And(GE(vertex, zero), LE(vertex, kmax)) for _, vertex in vertices])
         return self.color_constraints
 
 
@@ -101,6 +144,25 @@ class NLAColorerPySMT(ColorerPySMT):
     Formula: Forall vi in V: vi(vi-1)...(vi-(k-1)) = 0
     """
 
+    def balanced_times(self, terms):
+        """
+        Multiply terms as a balanced binary tree of Times.
+
+        A balanced tree has depth log2(k) instead of the depth k of one n-ary Times.
+
+        Args:
+            terms (list): A non-empty list of pySMT integer formulas.
+
+        Returns:
+            FNode: The product of the terms.
+        """
+        while len(terms) > 1:
+            paired = [Times(a, b) for a, b in zip(terms[::2], terms[1::2])]
+            if len(terms) % 2:
+                paired.append(terms[-1])
+            terms = paired
+        return terms[0]
+
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Non-Linear Arithmetic.
@@ -114,13 +176,15 @@ class NLAColorerPySMT(ColorerPySMT):
         if self.color_constraints:
             return self.color_constraints
         
-        for v in nodes:
-            vertex = Symbol(f"v_{v}", INT)
-            self.vertex_symbols[v] = vertex
-            colorer_vi = []
-            for i in range(self.num_colors):
-                colorer_vi.append(Minus(vertex, Int(i)))
-            self.color_constraints.append(Equals(Times(colorer_vi), Int(0)))
+        # The color constants are shared by all vertices.
+        zero = self._int_const_cache[0]
+        offsets = self._int_const_cache[:self.num_colors]
+
+        vertices = [(v, Symbol("v_%s" % v, INT)) for v in nodes]
+        self.vertex_symbols.update(vertices)
+        self.color_constraints.extend([
+            Equals(self.balanced_times([Minus(vertex, offset) for offset in offsets]), zero)
+            for _, vertex in vertices])
         return self.color_constraints
 
 
@@ -158,6 +222,17 @@ class ArrayUFColorerPySMT(ColorerPySMT):
         """
         return self.color_symbols
 
+    def first_color(self):
+        """
+        Get one fixed color of the encoding, used for symmetry breaking.
+
+        The vertices take the values of the color symbols, the first one is c_1.
+
+        Returns:
+            FNode: The color symbol c_1.
+        """
+        return self.color_symbols["c_1"]
+
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Arrays with Uninterpreted Functions.
@@ -173,40 +248,21 @@ class ArrayUFColorerPySMT(ColorerPySMT):
 
         IndexType = Type("IndexType")
         ElementType = Type("ElementType")
+        arr_type = ArrayType(IndexType, ElementType)
  
         # Create color symbols
         for i in range(1, self.num_colors+1):
-            self.color_symbols[f"c_{i}"] = Symbol(f"c_{i}", ElementType)
+            self.color_symbols["c_%d" % i] = Symbol("c_%d" % i, ElementType)
 
         # Ensure all colors are different
-        for i in range(1, self.num_colors+1):
-            for j in range(i+1, self.num_colors+1):
-                self.color_constraints.append(
-                    Not(Equals(self.color_symbols[f"c_{i}"], self.color_symbols[f"c_{j}"]))
-                )
-
-        for v in nodes:
-            vertex = Symbol(f"v_{v}", ElementType)
-            self.vertex_symbols[v] = vertex
-
-            ass_vi = []
-            arr1 = Symbol(f"arr0_v{v}", ArrayType(IndexType, ElementType))
-            
-            i1 = Symbol(f"i1_v{v}", IndexType)
-            prev_arr = Symbol(f"arr1_v{v}", ArrayType(IndexType, ElementType))
-            ass_vi.append(Equals(prev_arr, Store(arr1, i1, self.color_symbols[f"c_{1}"])))
-          
-            for i in range(2, self.num_colors+1):
-                cur_i  = Symbol(f"i{i}_v{v}", IndexType)
-                cur_arr = Symbol(f"arr{i}_v{v}", ArrayType(IndexType, ElementType))
-                ass_vi.append(
-                    Equals(
-                        cur_arr, 
-                        Store(prev_arr, cur_i, self.color_symbols[f"c_{i}"])))
-                prev_arr = cur_arr 
-
-            ass_vi.append(Equals(vertex, Select(prev_arr, i1)))
-            self.color_constraints.extend(ass_vi)
+        colors = list(self.color_symbols.values())
+        if len(colors) > 1:
+            self.color_constraints.append(AllDifferent(colors))
+
+        vertices = [(v, Symbol("v_%s" % v, ElementType)) for v in nodes]
+        self.vertex_symbols.update(vertices)
+        self.color_constraints.extend([
+            array_chain_constraint(v, vertex, arr_type, IndexType, colors) for v, vertex in vertices])
         return self.color_constraints
 
 
@@ -225,6 +281,17 @@ class ArrayINTColorerPySMT(ColorerPySMT):
              v = A_k[i_1]
     """
 
+    def first_color(self):
+        """
+        Get one fixed color of the encoding, used for symmetry breaking.
+
+        The stored colors are 1 ... k, the first one is 1.
+
+        Returns:
+            FNode: The integer 1.
+        """
+        return self._int_const_cache[1]
+
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Arrays with Integers.
@@ -238,26 +305,14 @@ class ArrayINTColorerPySMT(ColorerPySMT):
         if self.color_constraints:
             return self.color_constraints
     
-        for v in nodes:
-            vertex = Symbol(f"v_{v}", INT)
-            self.vertex_symbols[v] = vertex
-
-            ass_vi = []
-            arr1 = Symbol(f"arr0_v{v}", ArrayType(INT, INT))
-            
-            i1 = Symbol(f"i1_v{v}", INT)
-            prev_arr = Symbol(f"arr1_v{v}", ArrayType(INT, INT))
-            ass_vi.append(Equals(prev_arr, Store(arr1, i1, Int(1))))
-          
-            for i in range(2, self.num_colors + 1):
-                cur_i  = Symbol(f"i{i}_v{v}", INT)
-                cur_arr = Symbol(f"arr{i}_v{v}", ArrayType(INT, INT))
-                ass_vi.append(Equals(cur_arr, Store(prev_arr, cur_i, Int(i))))
-                prev_arr = cur_arr 
-
-            ass_vi.append(Equals(vertex, Select(prev_arr, i1)))
-
-            self.color_constraints.extend(ass_vi)
+        # The array type and the stored values are shared by all vertices.
+        arr_t = ArrayType(INT, INT)
+        val_consts = self._int_const_cache[1:]
+
+        vertices = [(v, Symbol("v_%s" % v, INT)) for v in nodes]
+        self.vertex_symbols.update(vertices)
+        self.color_constraints.extend([
+            array_chain_constraint(v, vertex, arr_t, INT, val_consts) for v, vertex in vertices])
         return self.color_constraints
 
 
@@ -276,6 +331,17 @@ class ArrayBVColorerPySMT(ColorerPySMT):
              v = A_k[i_1]
     """
 
+    def first_color(self):
+        """
+        Get one fixed color of the encoding, used for symmetry breaking.
+
+        The stored colors are the bit-vectors 0 ... k-1, the first one is 0.
+
+        Returns:
+            FNode: The zero bit-vector.
+        """
+        return BV(0, max(1, (self.num_colors - 1).bit_length()))
+
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Arrays with Bit-Vectors.
@@ -289,28 +355,18 @@ class ArrayBVColorerPySMT(ColorerPySMT):
         if self.color_constraints:
             return self.color_constraints
     
-        num_bits = math.ceil(math.log2(self.num_colors))
-
-        for v in nodes:
-            vertex = Symbol(f"v_{v}", BVType(num_bits))
-            self.vertex_symbols[v] = vertex
-
-            ass_vi = []
-            arr1 = Symbol(f"arr0_v{v}", ArrayType(BVType(num_bits), BVType(num_bits)))
-            
-            i1 = Symbol(f"i1_v{v}", BVType(num_bits))
-            prev_arr = Symbol(f"arr1_v{v}", ArrayType(BVType(num_bits), BVType(num_bits)))
-            ass_vi.append(Equals(prev_arr, Store(arr1, i1, BV(0, num_bits))))
-          
-            for i in range(2, self.num_colors + 1):
-                cur_i  = Symbol(f"i{i}_v{v}", BVType(num_bits))
-                cur_arr = Symbol(f"arr{i}_v{v}", ArrayType(BVType(num_bits), BVType(num_bits)))
-                ass_vi.append(Equals(cur_arr, Store(prev_arr, cur_i, BV(i-1, num_bits))))
-                prev_arr = cur_arr 
-
-            ass_vi.append(Equals(vertex, Select(prev_arr, i1)))
-
-            self.color_constraints.extend(ass_vi)
+        # Exact number of bits for the values 0 ... k-1, at least 1.
+        num_bits = max(1, (self.num_colors - 1).bit_length())
+
+        # The types and the stored values are shared by all vertices.
+        bv_t = BVType(num_bits)
+        arr_t = ArrayType(bv_t, bv_t)
+        val_consts = [BV(i-1, num_bits) for i in range(1, self.num_colors + 1)]
+
+        vertices = [(v, Symbol("v_%s" % v, bv_t)) for v in nodes]
+        self.vertex_symbols.update(vertices)
+        self.color_constraints.extend([
+            array_chain_constraint(v, vertex, arr_t, bv_t, val_consts) for v, vertex in vertices])
         return self.color_constraints
 
 
@@ -334,13 +390,25 @@ class BVColorerPySMT(ColorerPySMT):
 
         Args:
             num_colors (int): The number of colors to use for graph coloring. Must be a power of 2.
+
+        Raises:
+            ValueError: If the number of colors is not a power of 2.
         """
-        condition = (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0
-        if condition:
-            self.object = None
-        else:
-            super().__init__(num_colors)
+        if (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0:
+            raise ValueError("num_colors must be a power of 2")
+        super().__init__(num_colors)
     
+    def first_color(self):
+        """
+        Get one fixed color of the encoding, used for symmetry breaking.
+
+        Every bit-vector is a color, the first one is 0.
+
+        Returns:
+            FNode: The zero bit-vector.
+        """
+        return BV(0, self.num_colors.bit_length() - 1)
+
     def create_color_constraints(self, nodes):
         """
         Create color constraints using Bit-Vectors. Check formula for details
@@ -358,10 +426,8 @@ class BVColorerPySMT(ColorerPySMT):
             return []
         
         
-        bv_length = int(math.log2(self.num_colors))
+        bv_length = self.num_colors.bit_length() - 1
 
-        for v in nodes:
-            vertex = Symbol(f"v_{v}", BVType(bv_length))
-            self.vertex_symbols[v] = vertex
-        
+        bv_t = BVType(bv_length)
+        self.vertex_symbols.update((v, Symbol("v_%s" % v, bv_t)) for v in nodes)
         return []
\ No newline at end of file
@@ -11,6 +11,9 @@ Classes:
 
 """
 
+import networkx as nx
+from presolve import dsatur_coloring
+
 class GraphEnc:
     """
     An abstract base class for encoding k-coloring problem for undirected graph 
@@ -21,17 +24,30 @@ class GraphEnc:
         - add_constraints()
         - get_formula()
         - create_reduction()
+        - iter_formula_assertions()
         - get_formula_assertions()
         - get_solution()
         - solve()
+        - get_edges()
+        - symmetry_vertex()
+        - first_color_value()
+        - trivial_solution()
 
     Attributes:
         graph: The graph to be colored.
         colorer: The coloring strategy to be used. It changes in context of theory.
         solver: The solver instance to be used for finding a solution.
         graph_constraints (list): A list to store constraints of fomula.
+        skip_smt (bool): Whether easy instances are colored without calling the solver,
+                         see trivial_solution(). Off by default, so the solvers are always benchmarked.
+        symmetry_breaking (bool): Whether the vertex of maximum degree is fixed to the first
+                                  color of the colorer, see symmetry_vertex().
+        timeout (int): The time limit in seconds the solver was created with, 0 for none.
+                       solve() raises TimeoutError when the solver stops at the limit.
 
     """
+    symmetry_breaking = True
+
     def __init__(self, graph, colorer, solver):
         """
         Initialize a new GraphEnc instance.
@@ -45,6 +61,13 @@ class GraphEnc:
         self.colorer = colorer
         self.solver = solver
         self.graph_constraints = []
+        self.skip_smt = False
+        self.timeout = 0
+        self._trivial = None
+        self._trivial_checked = False
+        self._formula = None            # Flat list of all constraints, see get_formula().
+        self._edges = None              # Edges of the graph, see get_edges().
+        self._cached_formula = None     # Solver formula built from it, set by the subclasses.
     
 
     def __enter__(self):
@@ -92,17 +115,37 @@ class GraphEnc:
         Get the complete formula for the graph coloring problem.
 
         This method combines color constraints and graph-specific constraints.
+        The list is built once, repeated calls return the same list.
 
         Returns:
             Formula: With all constraints
         """
+        if self._formula is not None:
+            return self._formula
+
         formula = self.colorer.create_color_constraints(self.graph.nodes()) # create colors and vertecies constraints
         if self.graph_constraints == []:
             self.add_constraints()                  # If not created yes, crete esges contraints
-        formula.extend(self.graph_constraints)
-        return formula
+        # Copy, the colorer keeps (and may share) its own list of constraints.
+        self._formula = list(formula) + self.graph_constraints
+        return self._formula
     
 
+    def iter_formula_assertions(self):
+        """
+        Iterate over the formula assertions, one string at a time.
+
+        This method should be overridden by subclasses to implement
+        specific logic for obtaining formula assertions.
+
+        Yields:
+            str: The next constraint in string format.
+        Raises:
+            NotImplementedError: If this method is not overridden by a subclass.
+        """
+        raise NotImplementedError("This method should be overridden by subclasses")
+
+
     def get_formula_assertions(self):
         """
         Get the formula assertions.
@@ -158,3 +201,86 @@ class GraphEnc:
             Solver: The solver instance (either CVC5 or pySMT) used for this graph encoding.
         """
         return self.solver
+
+
+    def get_edges(self):
+        """
+        Get the edges of the graph, built once.
+
+        Returns:
+            tuple: The (u, v) node pairs in the order of graph.edges(), without multigraph keys.
+        """
+        if self._edges is None:
+            self._edges = tuple((e[0], e[1]) for e in self.graph.edges())
+        return self._edges
+
+
+    def symmetry_vertex(self):
+        """
+        Get the vertex whose color is fixed to break the color symmetry.
+
+        The edge constraints only require different colors, so the colors of any
+        solution can be permuted. Fixing the color of one vertex is therefore sound,
+        and the vertex of maximum degree restricts most of its neighbors.
+
+        Returns:
+            The vertex of maximum degree, or None if symmetry breaking is disabled
+            or the graph has no edges.
+        """
+        if not self.symmetry_breaking or self.graph.number_of_edges() == 0:
+            return None
+        return max(self.graph.degree, key=lambda x: x[1])[0]
+
+
+    def first_color_value(self):
+        """
+        Get the smallest color of the solutions of get_solution().
+
+        Subclasses with encodings whose colors do not start at 0 override this method.
+
+        Returns:
+            int: The first color, 0 by default.
+        """
+        return 0
+
+
+    def trivial_solution(self):
+        """
+        Color the graph without the solver, if the instance is easy.
+
+        A graph without self-loops and with maximum degree smaller than k is
+        colored by the greedy algorithm, and a bipartite graph needs only 2 colors.
+        Otherwise the DSATUR heuristic is tried, see presolve.dsatur_coloring.
+        The colors start at first_color_value(), as the colors of get_solution().
+        The result is computed once, and the formula is not built for it, so callers
+        that only need a coloring should check it before get_formula().
+
+        Returns:
+            dict or None: A dictionary mapping nodes to colors, or None if the
+                          instance is not trivial or skip_smt is disabled.
+        """
+        if not self.skip_smt:
+            return None
+        if self._trivial_checked:
+            return self._trivial
+        self._trivial_checked = True
+
+        k = self.colorer.num_colors
+        graph = self.graph
+        if k < 1 or nx.number_of_selfloops(graph) > 0:
+            return None
+
+        if graph.number_of_edges() == 0:
+            coloring = dict.fromkeys(graph.nodes(), 0)
+        elif k > max(d for _, d in graph.degree()):
+            coloring = nx.greedy_color(graph)
+        elif k >= 2 and nx.is_bipartite(graph):
+            coloring = nx.bipartite.color(graph)
+        else:
+            coloring = dsatur_coloring(graph, k)
+
+        first = self.first_color_value()
+        if coloring is not None and first:
+            coloring = {n: c + first for n, c in coloring.items()}
+        self._trivial = coloring
+        return self._trivial
@@ -1,7 +1,20 @@
+from collections import deque
 from cvc5 import Kind
 from GraphEnc import GraphEnc
 import ColorerCVC5
 
+
+# Edge sets of the UNSAT cores found so far, by number of colors (see GraphEncCVC5.solve).
+# A graph that contains one of these edge sets cannot be colored with that number of colors.
+# Only the last UNSAT_CORES_SIZE cores of every number of colors are kept.
+_UNSAT_EDGE_CORES = {}
+UNSAT_CORES_SIZE = 64
+
+# Idle solvers and their colorer memos (see ColorerCVC5.new_solver_memo)
+# by (theory, search_model, unsat_cores, timeout), see reduction.create_cvc5.
+SOLVER_POOL = {}
+
+
 class GraphEncCVC5(GraphEnc):
     """
     A class that encodes k-coloring problems for undirected graphs using SMT formulas with CVC5.
@@ -12,64 +25,127 @@ class GraphEncCVC5(GraphEnc):
     Methods:
         - add_constraints()
         - get_formula()
+        - iter_formula_assertions()
         - get_formula_assertions()
+        - get_formula_assertions_grouped()
         - create_reduction()
         - get_solution()
         - solve()
+        - release()
 
     Attributes:
         Inherits all attributes from GraphEnc.
+        unsat_cores (bool): Whether UNSAT cores are cached and used to skip solving.
+        pool_key (tuple): The SOLVER_POOL key of a pooled solver, None if the solver is not pooled.
+        _asserted (bool): Whether the formula was asserted to the solver.
+        _sat (bool): The result of the last solver call of solve(), None before the first one.
     """
 
+    def __init__(self, graph, colorer, solver, unsat_cores = False):
+        """
+        Initialize a new GraphEncCVC5 instance.
+
+        Args:
+            graph: The graph to be colored.
+            colorer: The CVC5 coloring strategy to be used.
+            solver: The CVC5 solver instance.
+            unsat_cores (bool): Whether to cache UNSAT cores, the solver must be created
+                                with the "produce-unsat-cores" option. Defaults to False.
+        """
+        super().__init__(graph, colorer, solver)
+        self.unsat_cores = unsat_cores
+        self.pool_key = None
+        self._asserted = False
+        self._sat = None
+
+        # Nodes without edges need no color constraints.
+        colorer.set_isolated_nodes(v for v, nbrs in graph.adj.items() if not nbrs)
+
     def add_constraints(self):
         """
         Add graph constraints ensuring no two connected vertices share the same color.
 
         This method creates constraints for each edge in the graph, ensuring that
-        the vertices connected by the edge have different colors.
+        the vertices connected by the edge have different colors, followed by the
+        symmetry breaking constraint (see GraphEnc.symmetry_vertex).
 
         Returns:
             list: A list of edge constraints (CVC5 term objects).
         """
-        vertex_symbols = self.colorer.get_vertex_symbols()
-        edges = self.graph.edges()
-        
-        for e in edges:
-            self.graph_constraints.append(
-                self.solver.mkTerm(
-                    Kind.DISTINCT,
-                    vertex_symbols[e[0]],
-                    vertex_symbols[e[1]]))
+        vs = self.colorer.get_vertex_symbols()
+        mk, distinct = self.solver.mkTerm, Kind.DISTINCT
 
+        self.graph_constraints.extend([mk(distinct, vs[u], vs[v]) for u, v in self.get_edges()])
+
+        # Added after the edges, the UNSAT core mapping in solve() zips the edges with the first constraints.
+        h = self.symmetry_vertex()
+        if h is not None:
+            self.graph_constraints.append(mk(Kind.EQUAL, vs[h], self.colorer.first_color()))
         return self.graph_constraints
 
     def get_formula(self):
         """
         Get the complete formula for the graph coloring problem.
 
-        This method combines all constraints into a single AND formula.
+        This method combines all constraints into a single AND formula,
+        which is built once.
 
         Returns:
             cvc5.Term: The AND of all constraints in the formula.
         """
+        if self._cached_formula is not None:
+            return self._cached_formula
+
         formula = super().get_formula()  # Calls the superclass method to get constraints.
-        return self.solver.mkTerm(Kind.AND, *formula)
+        if len(formula) == 0:
+            self._cached_formula = self.solver.mkTrue()
+        elif len(formula) == 1:
+            self._cached_formula = formula[0]
+        else:
+            self._cached_formula = self.solver.mkTerm(Kind.AND, *formula)
+        return self._cached_formula
+
+
+    def iter_formula_assertions(self):
+        """
+        Iterate over the formula assertions as strings.
+
+        Every assertion is printed by cvc5 only when it is reached, so a caller that
+        stops early or writes the strings out one at a time never holds all of them.
+        The constraint list cached by get_formula is used, so solve() does not build
+        the constraints again.
+
+        Yields:
+            str: The next assertion.
+        """
+        for assertion in super().get_formula():
+            yield str(assertion)
 
 
     def get_formula_assertions(self):
         """
         Get the formula assertions.
 
-        This method returns the formula assertions as CVC5 terms.
+        This method returns the formula assertions as strings, see iter_formula_assertions.
 
         Returns:
-            list: A list of CVC5 term objects representing the assertions.
+            list: A list of the assertions as strings.
         """
-        formula = super().get_formula()
-        ass_list = []
-        for assertion in formula:
-            ass_list.append(str(assertion))
-        return ass_list
+        return list(self.iter_formula_assertions())
+
+
+    def get_formula_assertions_grouped(self):
+        """
+        Get the formula assertions, with one color constraint per vertex.
+
+        Colorers that emit several assertions per vertex (e.g. LIA bounds) are
+        grouped into one term per vertex, the solver formula is not affected.
+
+        Returns:
+            list: A list of the assertions as strings.
+        """
+        formula = self.colorer.group_constraints(super().get_formula())
+        return [str(assertion) for assertion in formula]
     
 
 
@@ -79,47 +155,139 @@ class GraphEncCVC5(GraphEnc):
         """
         Get the solution for the graph coloring problem.
 
-        This method solves the problem and retrieves the coloring solution.
-        It handles different types of colorers (LIA, NLA, and others) and assigns colors accordingly.
+        This method retrieves the coloring solution from the model of the last solve() call,
+        the solver is not called again. If solve() was not called yet, it is called first.
+        It handles different types of colorers (LIA, NLA, BV, and others) and assigns colors accordingly.
+        The values of all vertices are queried from the solver in one call, and integer and
+        bit-vector values are read directly instead of being printed and parsed.
 
         Returns:
             dict or None: A dictionary mapping nodes to colors if a solution is found, 
                           or None if no solution exists.
-                          Colors are encoded as integer numbers.
+                          Colors are encoded as Python integers.
 
         Note: All exceptions that can be raised in CVC5 are not caught and will be raised as well.
         """
+        trivial = self.trivial_solution()
+        if trivial is not None:
+            return dict(trivial)
+
         symbols = self.colorer.get_vertex_symbols()
-        nodes = self.graph.nodes()
+        nodes = list(self.graph.nodes())
 
-        if not self.solver.checkSat().isSat():
+        if self._sat is None:
+            self.solve()
+        if not self._sat:
             return None
+
+        # Get the values of all vertices in one call.
+        values = self.solver.getValue([symbols[n] for n in nodes]) if nodes else []
         
         # In case the theory works with integers, we use a direct approach.
-        if isinstance(self.colorer, (ColorerCVC5.LIAColorerCVC5, ColorerCVC5.NLAColorerCVC5)):
-            return {n: self.solver.getValue(symbols[n]) for n in nodes}
+        if isinstance(self.colorer, (ColorerCVC5.LIAColorerCVC5, ColorerCVC5.NLAColorerCVC5,
+                                     ColorerCVC5.ProductNLAColorerCVC5)):
+            return {n: value.getIntegerValue() for n, value in zip(nodes, values)}
+
+        # Bit-vector values are the colors themselves.
+        if isinstance(self.colorer, ColorerCVC5.BVColorerCVC5):
+            return {n: int(value.getBitVectorValue(10)) for n, value in zip(nodes, values)}
 
         # Otherwise, we go through all assignments and create a symbol-integer map ourselves.
-        solution = {}
+        # Model values are hashed and compared as terms, so they are not printed to strings.
         color_map = {}
-        next_color = 0
-        for n in self.graph.nodes():
-            term_str = str(self.solver.getValue(symbols[n]))
-            if term_str not in color_map:
-                color_map[term_str] = next_color
-                next_color += 1
-            solution[n] = color_map[term_str]
-        return solution
+        return {n: color_map.setdefault(value, len(color_map)) for n, value in zip(nodes, values)}
 
     def solve(self):
         """
         Solve the graph coloring problem.
 
         This method adds the formula to the solver and attempts to solve it.
+        The formula is asserted only on the first call, as one AND term
+        (see get_formula), so calling solve again does not re-send it.
 
         Returns:
             bool: True if a solution is found, False otherwise.
+
+        Raises:
+            TimeoutError: If the solver stopped at its time limit.
         """
+        # Easy instances are colored without the solver.
+        if self.trivial_solution() is not None:
+            return True
+
         # Add color constraints from the colorer and call the solver's solve function.
-        self.solver.assertFormula(self.get_formula())
-        return self.solver.checkSat().isSat()
\ No newline at end of file
+        if not self.unsat_cores:
+            if not self._asserted:
+                self.solver.assertFormula(self.get_formula())
+                self._asserted = True
+            self._sat = self._check_sat()
+            return self._sat
+
+        # Any encoding of a graph that contains a known UNSAT edge set is UNSAT as well.
+        edges = [frozenset(e) for e in self.get_edges()]
+        cores = _UNSAT_EDGE_CORES.setdefault(self.colorer.num_colors, deque(maxlen=UNSAT_CORES_SIZE))
+        edge_set = frozenset(edges)
+        if any(core <= edge_set for core in cores):
+            self._sat = False
+            return False
+
+        # Assert the constraints one by one, so the core names the edges.
+        if not self._asserted:
+            for assertion in super().get_formula():
+                self.solver.assertFormula(assertion)
+            self._asserted = True
+        result = self._check()
+        self._sat = result.isSat()
+        if self._sat:
+            return True
+        if not result.isUnsat():
+            # Unknown without a time limit, there is no core.
+            return False
+
+        # add_constraints creates one constraint per edge, in the order of get_edges().
+        edge_of = dict(zip(self.graph_constraints, edges))
+        cores.append(frozenset(edge_of[t] for t in self.solver.getUnsatCore() if t in edge_of))
+        return False
+
+
+    def _check(self):
+        """
+        Check the satisfiability of the asserted formula.
+
+        Returns:
+            cvc5.Result: The result of the solver.
+
+        Raises:
+            TimeoutError: If the solver stopped at its time limit (see reduction.create_cvc5).
+        """
+        result = self.solver.checkSat()
+        if self.timeout and result.isUnknown():
+            raise TimeoutError("The solver reached the time limit.")
+        return result
+
+
+    def _check_sat(self):
+        """
+        Check the satisfiability of the asserted formula, see _check.
+
+        Returns:
+            bool: True if the formula is satisfiable, False otherwise.
+        """
+        return self._check().isSat()
+
+
+    def release(self):
+        """
+        Retract the formula of this encoding and return a pooled solver to SOLVER_POOL.
+
+        The solver goes back with the memo of the colorer, so the next encoding on the
+        solver reuses the color constraints and sorts built so far.
+        Encodings without a pooled solver (see reduction.create_cvc5) are not affected.
+        The encoding must not be used after release.
+        """
+        if self.pool_key is not None:
+            self.solver.pop()
+            SOLVER_POOL[self.pool_key] = (self.solver, self.colorer.memo)
+            self.pool_key = None
+            self._asserted = False
+            self._sat = None
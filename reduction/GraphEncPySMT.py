@@ -1,7 +1,16 @@
-from pysmt.shortcuts import  And, Equals, Not
+from pysmt.shortcuts import  And, Equals, Not, Symbol, Int, GE, LE, Ite
+from pysmt.typing import INT
+from pysmt.printers import HRPrinter
+from io import StringIO
 from GraphEnc import GraphEnc
 from ColorerPySMT import ArrayUFColorerPySMT, BVColorerPySMT, ArrayBVColorerPySMT
-from pysmt.solvers.msat import MathSAT5Solver
+from pysmt.exceptions import SolverReturnedUnknownResultError, SolverAPINotFound
+
+try:
+    from pysmt.solvers.msat import MathSAT5Solver
+except SolverAPINotFound:
+    # MathSAT is not installed (e.g. under PyPy), no solver is a MathSAT5Solver.
+    MathSAT5Solver = None
 
 
 
@@ -15,65 +24,168 @@ class GraphEncPySMT(GraphEnc):
     Methods:
         - add_constraints()
         - get_formula()
+        - iter_formula_assertions()
         - get_formula_assertions()
         - create_reduction()
         - get_solution()
         - solve()
+        - first_color_value()
+        - release()
+        - prepare_edge_core()
+        - try_k()
 
     Attributes:
         Inherits all attributes from GraphEnc.
+        _asserted (bool): Whether the formula was pushed into the solver.
+        _sat (bool): The result of the last solver call of solve(), None before the first one.
+        _core_symbols (dict): Integer vertex symbols of the asserted edge core, see prepare_edge_core().
     """
 
+    def __init__(self, graph, colorer, solver):
+        """
+        Initialize a new GraphEncPySMT instance.
+
+        Args:
+            graph: The graph to be colored.
+            colorer: The coloring strategy to be used.
+            solver: The pySMT solver instance. It may be shared between several encodings,
+                    see release().
+        """
+        super().__init__(graph, colorer, solver)
+        self._asserted = False
+        self._sat = None
+        self._core_symbols = None
+        self._assertions = None
+
     def add_constraints(self):
         """
         Add graph constraints ensuring no two connected vertices share the same color.
 
         This method creates constraints for each edge in the graph, ensuring that
-        the vertices connected by the edge have different colors.
+        the vertices connected by the edge have different colors. Parallel edges
+        and both directions of an edge give one constraint. Self-loops are kept,
+        they make the formula unsatisfiable. The symmetry breaking constraint
+        (see GraphEnc.symmetry_vertex) is added last.
 
         Returns:
             list: A list of edge constraints (pySMT formula nodes).
         """
-       
-        vertex_symbols = self.colorer.get_vertex_symbols()
-        edges = self.graph.edges()
-
-        for e in edges:
-            self.graph_constraints.append(
-                Not(Equals(vertex_symbols[e[0]], vertex_symbols[e[1]]))
-            )
+        vs = self.colorer.get_vertex_symbols()
+        _Not, _Equals = Not, Equals
+        self.graph_constraints.extend(_Not(_Equals(vs[u], vs[v])) for u, v in self._unique_edges())
+        self.graph_constraints.extend(self._symmetry_constraints())
         return self.graph_constraints
 
+    def _symmetry_constraints(self):
+        """
+        Get the symmetry breaking constraint, fixing one vertex to the first color.
+
+        Returns:
+            list: The constraint in a list, or an empty list if there is no symmetry vertex.
+        """
+        h = self.symmetry_vertex()
+        if h is None:
+            return []
+        return [Equals(self.colorer.get_vertex_symbols()[h], self.colorer.first_color())]
+
+    def _unique_edges(self):
+        """
+        Get the edges of the graph without parallel and reversed duplicates.
+
+        Returns:
+            tuple or list: The (u, v) node pairs, first occurrences in the order of graph.edges().
+        """
+        # A simple undirected graph has no duplicates, see reduction.create_reduction.
+        if not self.graph.is_multigraph() and not self.graph.is_directed():
+            return self.get_edges()
+
+        seen = set()
+        edges = []
+        for e in self.get_edges():
+            key = frozenset(e)
+            if key not in seen:
+                seen.add(key)
+                edges.append(e)
+        return edges
+
 
     def get_formula(self):
         """
         Get the complete formula for the graph coloring problem.
 
-        This method combines all constraints into a single AND formula.
+        This method combines all constraints into a single AND formula,
+        which is built once. If the list of constraints was not built yet
+        (see get_formula_assertions), the constraints are streamed into the AND
+        without keeping a separate list of them.
 
         Returns:
             pysmt.fnode.FNode: The AND of all constraints in the formula.
         """
-        formula = super().get_formula() # Calls the superclass method to get constraints and then create a formula using And.
-        return And(formula)
+        if self._cached_formula is None:
+            if self._formula is not None:
+                self._cached_formula = And(self._formula)
+            else:
+                self._cached_formula = And(self._iter_all_constraints())
+        return self._cached_formula
+
+
+    def _iter_all_constraints(self):
+        """
+        Generate the color constraints followed by the edge constraints.
+
+        The edge constraints are created lazily and are not stored in graph_constraints.
+
+        Yields:
+            pysmt.fnode.FNode: The constraints of the formula.
+        """
+        yield from self.colorer.create_color_constraints(self.graph.nodes())
+
+        vs = self.colorer.get_vertex_symbols()
+        _Not, _Equals = Not, Equals
+        for u, v in self._unique_edges():
+            yield _Not(_Equals(vs[u], vs[v]))
+        yield from self._symmetry_constraints()
     
     
+    def iter_formula_assertions(self):
+        """
+        Iterate over the formula assertions as serialized strings.
+
+        Every assertion is serialized only when it is reached, the same as FNode.serialize().
+        The strings are not kept, unless get_formula_assertions already built them.
+
+        Yields:
+            str: The next serialized assertion.
+        """
+        if self._assertions is not None:
+            yield from self._assertions
+            return
+
+        formula = super().get_formula()     # Get all assertions.
+
+        # One printer and buffer for all assertions, instead of a new pair per serialize() call.
+        buf = StringIO()
+        printer = HRPrinter(buf)
+        for assertion in formula:
+            printer.printer(assertion)
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+
+
     def get_formula_assertions(self):
         """
         Get the formula assertions as serialized strings.
 
-        This method converts each assertion in the formula to a serialized string representation.
+        This method converts each assertion in the formula to a serialized string representation,
+        see iter_formula_assertions. The strings are built once.
 
         Returns:
             list: A list of serialized assertions (strings).
         """
-        formula = super().get_formula()     # Get all assertions.
-        ass_list = []
-
-        # Create a list of assertions represented as strings.
-        for assertion in formula:
-            ass_list.append(assertion.serialize())
-        return ass_list
+        if self._assertions is None:
+            self._assertions = list(self.iter_formula_assertions())
+        return self._assertions
         
     
 
@@ -81,7 +193,8 @@ class GraphEncPySMT(GraphEnc):
         """
         Get the solution for the graph coloring problem.
 
-        This method solves the problem and retrieves the coloring solution.
+        This method retrieves the coloring solution from the model of the last solve() call,
+        the solver is not called again. If solve() was not called yet, it is called first.
         It handles different types of colorers (ArrayUF, BV, ArrayBV) and solvers.
 
         Returns:
@@ -95,16 +208,23 @@ class GraphEncPySMT(GraphEnc):
             Note: All exceptions that can be raised in pysmt (like NotImplemented) are not caught, and will be raised as well.
 
         """
+        trivial = self.trivial_solution()
+        if trivial is not None:
+            return dict(trivial)
+
         # get nodes data
         vertex_symbols = self.colorer.get_vertex_symbols()
         nodes = self.graph.nodes()
 
-        # If there is no solution return None
-        if not self.solve():
+        # If there is no solution return None. The model of the last solve() is read,
+        # the solver is called only if solve() was not called yet.
+        if self._sat is None:
+            self.solve()
+        if not self._sat:
             return None
 
         # Check if the solver can provide a model
-        if isinstance(self.solver, MathSAT5Solver) and isinstance(self.colorer, ArrayUFColorerPySMT):
+        if MathSAT5Solver is not None and isinstance(self.solver, MathSAT5Solver) and isinstance(self.colorer, ArrayUFColorerPySMT):
             raise Exception("MathSAT5Solver cannot access assigned values for custom types")
         else:
             model = self.solver.get_model()
@@ -113,15 +233,18 @@ class GraphEncPySMT(GraphEnc):
 
         # Z3 can work with custom types in arrays, but cannot return its model either. But it can be solved
         # as solving another formula in context of the model. 
-        # Therefore, we iterate over all vertices and all color symbols and check if vi=cj.
-        # If result is True then color of vi is cj.
+        # Therefore, for every vertex we evaluate the integer term
+        # ite(vi=c1, 0, ite(vi=c2, 1, ... k-1)), which gives the index of its color
+        # with one model query per vertex instead of one query per vertex and color.
         if isinstance(self.colorer, ArrayUFColorerPySMT):
-            color_symbols = self.colorer.get_color_symbols()
+            colors = list(self.colorer.get_color_symbols().values())
+            indices = [Int(i) for i in range(len(colors))]
             for n in nodes:
-                for i, c in enumerate(color_symbols, start=0):
-                    if model.get_value(Equals(vertex_symbols[n], color_symbols[c])).is_true():
-                        result[n] = i
-                        break
+                vertex = vertex_symbols[n]
+                color_index = indices[-1]   # Every vertex is one of the colors.
+                for i in range(len(colors) - 2, -1, -1):
+                    color_index = Ite(Equals(vertex, colors[i]), indices[i], color_index)
+                result[n] = model.get_value(color_index).constant_value()
             return result
         
         # In the case of BV, we want to represent the bit vector as an integer.
@@ -141,12 +264,116 @@ class GraphEncPySMT(GraphEnc):
         """
         Solve the graph coloring problem.
 
-        This method adds the formula to the solver and attempts to solve it.
+        This method adds the formula to the solver in its own assertion level
+        and attempts to solve it. The formula is asserted only on the first call,
+        so calling solve again does not re-send it.
 
         Returns:
             bool: True if a solution is found, False otherwise.
+
+        Raises:
+            TimeoutError: If the solver stopped at its time limit.
         """
+        # Easy instances are colored without the solver.
+        if self.trivial_solution() is not None:
+            return True
+
         # Add color constraints from the colorer and call the solver's solve function.
-        self.solver.add_assertion(self.get_formula())
-        return self.solver.solve()
+        if not self._asserted:
+            self.solver.push()
+            self.solver.add_assertion(self.get_formula())
+            self._asserted = True
+        try:
+            self._sat = self.solver.solve()
+            return self._sat
+        except SolverReturnedUnknownResultError:
+            # z3 returns unknown when it stops at its time limit (see reduction.create_pysmt).
+            if self.timeout:
+                raise TimeoutError("The solver reached the time limit.")
+            raise
+
+
+    def first_color_value(self):
+        """
+        Get the smallest color of the solutions of get_solution().
+
+        The colors of ArrayUF are numbered from 0 by get_solution(), the other
+        encodings start at the value of colorer.first_color() (1 for ArrayINT).
+
+        Returns:
+            int: The first color.
+        """
+        if isinstance(self.colorer, ArrayUFColorerPySMT):
+            return 0
+        return int(self.colorer.first_color().constant_value())
+
+
+    def release(self):
+        """
+        Retract the formula and the edge core (see prepare_edge_core) of this encoding from the solver.
 
+        After release the same solver can be reused for another encoding on the
+        same backend, instead of creating and initializing a new solver.
+        Note: pySMT symbols are global to the environment, so encodings in another
+        theory still need reset_env() and a new solver.
+        """
+        if self._asserted:
+            self.solver.pop()
+            self._asserted = False
+        if self._core_symbols is not None:
+            self.solver.pop()
+            self._core_symbols = None
+
+
+    def prepare_edge_core(self):
+        """
+        Assert the edge constraints over integer vertices, independent of the number of colors.
+
+        The edge core is asserted once in its own assertion level, then try_k() adds
+        only the color domain for each k. This way a sweep over k (e.g. to find the
+        chromatic number) builds and sends the edge constraints to the solver once.
+        The vertices are integer symbols "core_v_<node>", not the symbols of the colorer,
+        which are declared with other types by some theories (e.g. BV). release() pops the
+        edge core level.
+
+        Returns:
+            dict: A dictionary mapping graph vertices to their integer symbols.
+        """
+        if self._core_symbols is not None:
+            return self._core_symbols
+
+        symbols = {v: Symbol("core_v_%s" % v, INT) for v in self.graph.nodes()}
+        self.solver.push()
+        for u, v in self._unique_edges():
+            self.solver.add_assertion(Not(Equals(symbols[u], symbols[v])))
+        self._core_symbols = symbols
+        return symbols
+
+
+    def try_k(self, k):
+        """
+        Check whether the graph can be colored with k colors, on top of the edge core.
+
+        The domain constraints 0 <= v <= k-1 are asserted in a new assertion level,
+        which is popped again before returning, so try_k can be called for any
+        sequence of k. The model is not kept after the call, so a later get_solution()
+        calls solve() again.
+
+        Args:
+            k (int): The number of colors.
+
+        Returns:
+            bool: True if a k-coloring exists, False otherwise.
+        """
+        symbols = self.prepare_edge_core()
+        zero = Int(0)
+        kmax = Int(k - 1)
+
+        self.solver.push()
+        try:
+            for vertex in symbols.values():
+                self.solver.add_assertion(And(GE(vertex, zero), LE(vertex, kmax)))
+            return self.solver.solve()
+        finally:
+            self.solver.pop()
+            self._sat = None
@@ -1,42 +1,113 @@
 
 import sys
 import os
+import re
+import argparse
 import time
-from multiprocessing import Process, Queue  # Import necessary modules for multiprocessing
-from networkx.drawing.nx_pydot import read_dot
-from reduction import create_reduction, SOLVER_THEORY_MAP
+import atexit
+import signal
+import tempfile
+import traceback
+from collections import namedtuple
+from multiprocessing import Process, Pipe  # Import necessary modules for multiprocessing
+from multiprocessing.connection import wait
+from graph_reader import read_graph
+from pysmt.shortcuts import reset_env
+from reduction import create_reduction, check_reduction, SOLVER_THEORY_MAP
 
 
+# Input of create_and_solve, built by args_validation. ret_mod is True if a solution is needed,
+# no_formula is True if the formula is printed (unless --no-formula is given).
+ReducInput = namedtuple("ReducInput", ["solver", "theory", "num_colors", "graph", "ret_mod", "no_formula",
+                                       "skip_smt", "race"])
 
+# Persistent worker process of process_with_timeout, (process, connection, graph) or None.
+_worker = None
 
-def create_and_solve(reduc_input, output_queue):
+# Seconds the worker gets after the timeout before it is terminated, so the time limit
+# of the solver (see reduction.create_reduction) normally stops it first.
+_KILL_GRACE = 1
+
+
+
+
+def create_and_solve(reduc_input, formula_path = None, timeout = 0):
     """
-    Create a graph encoding reduction, solve it, and put the results in the output queue.
+    Create a graph encoding reduction, solve it, and return the results.
+
+    cvc5 takes an idle solver of the same options from the solver pool (see reduction.create_cvc5),
+    and the encoding is released at the end, so the inputs of the persistent worker share solvers.
 
     Args:
-        reduc_input (tuple): A tuple containing (solver, theory, num_colors, graph, ret_mod, no_formula),
+        reduc_input (ReducInput): The input (solver, theory, num_colors, graph, ret_mod, no_formula, skip_smt, race),
                          where 'model' is an argument for the cvc5 solver that specifies whether
                          a model should be generated or not. This determines if a solution or
                          only a binary result is needed.
-        output_queue (Queue): A multiprocessing Queue to store the results.
+        formula_path (str): A file the formula is written to, one assertion per line, instead
+                            of returning it as a list. Defaults to None.
+        timeout (int): The time limit of the solver in seconds, 0 for none. Defaults to 0.
 
-    The function puts a tuple in the output_queue containing:
-    (result, solution_list, formula, reduction_time, process_time, total_time)
+    Returns:
+        tuple: A tuple containing (result, solution_list, formula, reduction_time, process_time, total_time, theory),
+               where formula is formula_path if it is given.
+               Returns (None, "Timeout.", None, None, None, None, None) if the solver reached the time limit.
     """
+    if reduc_input.race:
+        return race_and_solve(reduc_input, timeout)
     
-    graph_enc = create_reduction(reduc_input[0], 
-                                    reduc_input[1],
-                                    reduc_input[2],
-                                    reduc_input[3],
-                                    reduc_input[4],
+    graph_enc = create_reduction(reduc_input.solver, 
+                                    reduc_input.theory,
+                                    reduc_input.num_colors,
+                                    reduc_input.graph,
+                                    reduc_input.ret_mod,
+                                    skip_smt=reduc_input.skip_smt,
+                                    # Checked once by args_validation.
+                                    validate=False,
+                                    timeout=timeout,
+                                    reuse_solver=True,
                                     )
-    
+    try:
+        return _solve_encoding(graph_enc, reduc_input, formula_path)
+    finally:
+        # A pooled cvc5 solver goes back to the pool, the next input of the worker reuses it.
+        graph_enc.release()
+
+
+
+def _solve_encoding(graph_enc, reduc_input, formula_path):
+    """
+    Build the formula of the encoding and solve it, see create_and_solve.
+
+    Args:
+        graph_enc (GraphEnc): The encoding created by create_and_solve.
+        reduc_input (ReducInput): The input of the encoding.
+        formula_path (str): A file the formula is written to, or None.
+
+    Returns:
+        tuple: The same as create_and_solve.
+    """
+    # Easy instances are colored without the solver (see GraphEnc.trivial_solution), and then
+    # the formula is not needed to solve them. The check is counted as solving time.
+    start_trivial = time.time()
+    trivial = graph_enc.trivial_solution()
+    trivial_time = time.time() - start_trivial
+    if trivial is not None:
+        # Printed by the worker process, flushed before the results are sent back.
+        print("The input is easy, it was colored without the solver (--shortcut).", flush=True)
 
     start_reduction_t = time.time()
-    if reduc_input[5]:
+    # For a trivial instance the formula is built only if it is printed, for display alone.
+    if reduc_input.no_formula and formula_path is not None:
+        # Every assertion is written as soon as it is printed, the list is never built.
+        with open(formula_path, "w") as f:
+            f.writelines(a + "\n" for a in graph_enc.iter_formula_assertions())
+        formula = formula_path
+    elif reduc_input.no_formula:
         formula = graph_enc.get_formula_assertions()
     else:
-        graph_enc.get_formula_assertions()
+        # Build the formula without printing its assertions, solve() reuses it.
+        if trivial is None:
+            graph_enc.get_formula()
         formula = None
         
     end_reduction_t = time.time()
@@ -44,68 +115,297 @@ def create_and_solve(reduc_input, output_queue):
     
     # Time processing
     start_process = time.time()
-    result = graph_enc.solve()
+    try:
+        result = graph_enc.solve()
+    except TimeoutError:
+        return None, "Timeout.", None,  None, None, None, None
     end_process = time.time()
 
 
     reduction_time = end_reduction_t - start_reduction_t
-    process_time = end_process - start_process
+    process_time = end_process - start_process + trivial_time
     total_time = process_time + reduction_time
 
    
     solution_list = []
-    if result and reduc_input[4]:
+    if result and reduc_input.ret_mod:
         try:
-            solution  = graph_enc.get_solution()
-            sorted_nodes = sorted(solution.keys(), key=lambda x: int(x) if x.isdigit() else x)
-            for v in sorted_nodes:
-                solution_list.append(f"{v}: {solution[v]}")
+            solution_list = format_solution(graph_enc.get_solution())
         except Exception as e:
             print(f"{e}")
     
         
 
 
-    output_queue.put((result, solution_list, formula, reduction_time, process_time, total_time))
+    return result, solution_list, formula, reduction_time, process_time, total_time, reduc_input.theory
 
 
 
-def process_with_timeout(reduc_input, timeout):
+def format_solution(solution):
     """
-    Run the graph coloring process with a specified timeout.
+    Format a solution as "node: color" lines, sorted by node name.
+
+    Numeric names come first in numeric order, then the other names. The sort key of
+    every node is built once, and ints are never compared to strings.
 
     Args:
-        reduc_input (tuple): A tuple containing (solver, theory, num_colors, graph, model).
-        timeout (int): The maximum time in seconds to wait for the process to complete.
+        solution (dict): A dictionary mapping node names to colors.
 
     Returns:
-        tuple: A tuple containing (result, solution, formula, reduction_time, process_time, total_time).
-               Returns (None, "Timeout.", None, None, None, None) if the process times out.
-               Returns (None, "Error: No output for process.", None, None, None, None) if there was problem with queue.
+        list: The formatted lines.
     """
-    output_queue = Queue()  # Create a Queue to receive results
-    process = Process(target=create_and_solve, args=(reduc_input, output_queue))
-    process.start()  # Start the process
+    keyed = [((0, int(v)) if v.isdigit() else (1, v), v) for v in solution]
+    keyed.sort()
+    return [f"{v}: {solution[v]}" for _, v in keyed]
+
+
+
+def race_and_solve(reduc_input, timeout = 0):
+    """
+    Race the portfolio theories of the solver on the graph and return the results of the first one.
+
+    See portfolio.solve_portfolio. The theories of portfolio.PORTFOLIO_THEORIES that the solver
+    supports are raced. The reductions are created and solved by the racing workers, so no
+    formula is returned and all the time is reported as process time.
+
+    Args:
+        reduc_input (ReducInput): The input (solver, theory, num_colors, graph, ret_mod, no_formula, skip_smt, race),
+                             the theory is ignored.
+        timeout (int): The time limit of every racing theory in seconds, 0 for none. Defaults to 0.
+
+    Returns:
+        tuple: A tuple containing (result, solution_list, formula, reduction_time, process_time, total_time, theory),
+               where theory is the theory that finished first.
+               Returns (None, "Timeout.", None, None, None, None, None) if all the theories reached the time limit.
+    """
+    # Imported only with --race, the portfolio races cvc5 by default (see run_under_pypy.sh).
+    from portfolio import solve_portfolio, PORTFOLIO_THEORIES
+
+    theories = [t for t in PORTFOLIO_THEORIES if t in SOLVER_THEORY_MAP[reduc_input.solver]]
+    start_process = time.time()
+    try:
+        theory, result, solution = solve_portfolio(reduc_input.graph, reduc_input.num_colors, theories,
+                                                   reduc_input.ret_mod, reduc_input.solver, timeout)
+    except TimeoutError:
+        return None, "Timeout.", None,  None, None, None, None
+    process_time = time.time() - start_process
+
+    solution_list = format_solution(solution) if result and reduc_input.ret_mod else []
+
+    return result, solution_list, None, 0.0, process_time, process_time, theory
+
+
+
+def _worker_loop(conn, graph):
+    """
+    Solve the inputs received on the connection until None is received.
+
+    Runs in the persistent worker process. Every input comes with the path of the file
+    the formula is written to and the timeout (see process_with_timeout). The result of every input is
+    sent back, or None if create_and_solve raised an exception (its traceback is printed).
+    Inputs without a graph (None) use the last graph of the worker.
+
+    The worker exits through SystemExit when it is terminated (see _stop_worker), so the
+    pool of a racing input (see race_and_solve) is stopped before the worker ends.
+
+    Args:
+        conn (Connection): The worker end of the pipe to the main process.
+        graph: The graph given when the worker was started.
+    """
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    for reduc_input, formula_path, timeout in iter(conn.recv, None):
+        if reduc_input.graph is None:
+            reduc_input = reduc_input._replace(graph=graph)
+        else:
+            graph = reduc_input.graph
+        # pySMT symbols are global, the previous input may have used the same names with other types.
+        reset_env()
+        try:
+            output = create_and_solve(reduc_input, formula_path, timeout)
+        except Exception:
+            traceback.print_exc()
+            output = None
+        conn.send(output)
+
+
+
+def _exit_on_sigterm(signum, frame):
+    """
+    Signal handler of the persistent worker, exits with cleanup instead of being killed.
+
+    Raises:
+        SystemExit: Always.
+    """
+    raise SystemExit(1)
+
+
+
+def _read_formula(formula_path):
+    """
+    Read the formula written by the worker, and remove the file when it is read.
+
+    Args:
+        formula_path (str): The file of the formula, see create_and_solve.
+
+    Yields:
+        str: The next assertion, with its line break.
+    """
+    try:
+        with open(formula_path) as f:
+            yield from f
+    finally:
+        os.unlink(formula_path)
+
 
-    if timeout == 0:
-        process.join()
-    else:
-        process.join(timeout)  # Wait for the process to finish or timeout
 
-    if process.is_alive():
-        # If the process is still running, terminate it
+def _get_worker(graph):
+    """
+    Get the persistent worker process, starting a new one if there is none.
+
+    A new worker is started with the graph, so with the fork start method (the
+    default on Linux) it inherits the graph instead of unpickling it.
+    The worker is not a daemon, so it may start the process pool of
+    race_and_solve. It is stopped at exit.
+
+    Args:
+        graph: The graph of the next input.
+
+    Returns:
+        tuple: A tuple containing (process, connection, graph), where graph is the last graph of the worker.
+    """
+    global _worker
+    if _worker is None or not _worker[0].is_alive():
+        conn, worker_conn = Pipe()
+        process = Process(target=_worker_loop, args=(worker_conn, graph))
+        process.start()
+        _worker = (process, conn, graph)
+    return _worker
+
+
+
+@atexit.register
+def _stop_worker():
+    """
+    Terminate the persistent worker process, if it is running.
+    """
+    global _worker
+    if _worker is not None:
+        process, conn, _ = _worker
+        _worker = None
         process.terminate()
         process.join()
-        return None, "Timeout.", None,  None, None, None
-    else:
-        if output_queue.empty():
-            # Handle cases where no output was put into the queue
-            return None, "Error: No output for process.", None, None, None, None
-        result = output_queue.get()
-        return result
-        
+        conn.close()
+
 
 
+def _solve_inline(reduc_input):
+    """
+    Solve the input in this process, see process_with_timeout.
+
+    Args:
+        reduc_input (ReducInput): The input, see create_and_solve.
+
+    Returns:
+        tuple: The same as process_with_timeout, without a timeout.
+    """
+    try:
+        result = create_and_solve(reduc_input)
+    except Exception:
+        traceback.print_exc()
+        return None, "Error: No output for process.", None, None, None, None, None
+
+    if result[2] is not None:
+        result = result[:2] + ((a + "\n" for a in result[2]),) + result[3:]
+    return result
+
+
+
+def process_with_timeout(reduc_input, timeout):
+    """
+    Run the graph coloring process with a specified timeout.
+
+    The input is solved by a persistent worker process, which is reused by the
+    following calls. On timeout or failure the worker is terminated and the next
+    call starts a new one. The graph is sent to the worker only if it is not the
+    last graph of the worker (see _get_worker). The worker writes the formula to a
+    temporary file, so it is not sent through the pipe and is read back lazily.
+    Without a timeout there is nothing to terminate, so the input is solved in this
+    process instead. The timeout is enforced by the solver (see create_and_solve), the
+    worker is terminated only if it is still running _KILL_GRACE seconds later.
+
+    Args:
+        reduc_input (ReducInput): The input, see create_and_solve.
+        timeout (int): The maximum time in seconds to wait for the process to complete, 0 for no timeout.
+
+    Returns:
+        tuple: A tuple containing (result, solution, formula, reduction_time, process_time, total_time, theory),
+               where formula is an iterator over the lines of the formula (see _read_formula) or None.
+               Returns (None, "Timeout.", None, None, None, None, None) if the process times out.
+               Returns (None, "Error: No output for process.", None, None, None, None, None) if the worker failed.
+    """
+    global _worker
+    if timeout == 0:
+        return _solve_inline(reduc_input)
+
+    formula_path = None
+    if reduc_input.no_formula:
+        fd, formula_path = tempfile.mkstemp(prefix="formula-", suffix=".txt")
+        os.close(fd)
+
+    try:
+        process, conn, worker_graph = _get_worker(reduc_input.graph)
+        if worker_graph is reduc_input.graph:
+            # The worker already has the graph, it is not pickled again.
+            conn.send((reduc_input._replace(graph=None), formula_path, timeout))
+        else:
+            conn.send((reduc_input, formula_path, timeout))
+            _worker = (process, conn, reduc_input.graph)
+
+        # Wait for the result or the end of the worker, whichever comes first.
+        ready = wait([conn, process.sentinel], timeout + _KILL_GRACE)
+
+        if conn in ready:
+            result = conn.recv()
+            if result is not None:
+                if formula_path is not None and result[2] == formula_path:
+                    # _read_formula removes the file.
+                    formula_path = None
+                    result = result[:2] + (_read_formula(result[2]),) + result[3:]
+                return result
+            _stop_worker()
+            return None, "Error: No output for process.", None, None, None, None, None
+
+        if not ready:
+            # If the process is still running, terminate it
+            _stop_worker()
+            return None, "Timeout.", None,  None, None, None, None
+
+        # The worker ended without sending a result.
+        _stop_worker()
+        return None, "Error: No output for process.", None, None, None, None, None
+    finally:
+        if formula_path is not None:
+            os.unlink(formula_path)
+
+
+
+
+
+# Command line of the tool, see args_validation.
+_ARG_PARSER = argparse.ArgumentParser(prog="reduction")
+_ARG_PARSER.add_argument("graph_path", help="path to the DOT file of the graph")
+_ARG_PARSER.add_argument("num_colors", help="number of colors, at least 3")
+_ARG_PARSER.add_argument("solver", help="name of the solver")
+_ARG_PARSER.add_argument("theory", help="name of the theory, ignored with --race")
+_ARG_PARSER.add_argument("--timeout", type=int, default=0, help="timeout in seconds, 0 for none")
+_ARG_PARSER.add_argument("--no-model", action="store_true", help="only decide colorability")
+_ARG_PARSER.add_argument("--no-formula", action="store_true", help="do not print the formula")
+_ARG_PARSER.add_argument("--shortcut", action="store_true", help="color easy inputs without the solver")
+_ARG_PARSER.add_argument("--race", action="store_true", help="race all the theories of the solver")
+
+# Timeout in the old format, --t-<seconds> (also --t--<seconds>).
+_OLD_TIMEOUT_ARG = re.compile(r"--t-+(\d+)")
+
 
 
 def args_validation():
@@ -117,26 +417,37 @@ def args_validation():
             - graph_data (dict): A dictionary with keys 'V' (number of vertices),
                                  'E' (number of edges), and 'time' (time to read the graph).
             - timeout (int): The timeout value in seconds.
-            - reduct_input (tuple): A tuple containing (solver, theory, num_colors, graph, ret_mod).
+            - reduct_input (ReducInput): The input (solver, theory, num_colors, graph, ret_mod, no_formula, skip_smt, race).
 
     Raises:
         SystemExit: If the arguments are invalid or the input file is not accessible.
     """
 
-    # Not enough arguments
-    if len(sys.argv) < 5:
-        print("Usage: python reduction <path_to_dot_file> <num_colors> <solver> <theory> [--ret_mod] [--no-formula]")
-        sys.exit(1)
+    args, unknown = _ARG_PARSER.parse_known_args()
+
+    # The old timeout format, --t-<seconds>, is still accepted.
+    timeout = args.timeout
+    for a in unknown:
+        if not a.startswith("--t-"):
+            _ARG_PARSER.error(f"unrecognized arguments: {' '.join(unknown)}")
+        match = _OLD_TIMEOUT_ARG.fullmatch(a)
+        if match is None:
+            timeout = -1
+            break
+        timeout = int(match.group(1))
+    if timeout < 0:
+        print("Wrong timeout format.")
+        exit(1)
 
     # File is not accessible
-    graph_path = sys.argv[1]
+    graph_path = args.graph_path
     if not (os.path.isfile(graph_path) and os.access(graph_path, os.R_OK)):
         print(f"Error: The file '{graph_path}' does not exist or is not accessible.")
         sys.exit(1)
     
     # Wrong type of argument number colors.
     try:
-        num_colors = int(sys.argv[2])
+        num_colors = int(args.num_colors)
         if num_colors < 3:
             raise ValueError
     except ValueError:
@@ -145,21 +456,18 @@ def args_validation():
     
 
     
-    solver = sys.argv[3]
-    theory = sys.argv[4]
+    solver = args.solver
+    theory = args.theory
     # If need a solution or only result.
-    ret_mod = not("--no-model" in sys.argv)
-    no_formula = not("--no-formula" in sys.argv)
-    timeout = 0
-
-    # take a timeout argument
-    try:
-        for a in sys.argv:
-            if "--t-" in a:
-                timeout = int(a.split('-')[-1])
-    except:
-        print("Wrong timeout format.")
-        exit(1)
+    ret_mod = not args.no_model
+    no_formula = not args.no_formula
+    # If easy instances may be colored without the solver.
+    skip_smt = args.shortcut
+    # If all the theories of the solver race, the theory argument is ignored.
+    race = args.race
+    if race:
+        # There is no single formula to print.
+        no_formula = False
     
 
     # There is noe such solver
@@ -167,26 +475,23 @@ def args_validation():
         print("Wrong value for solver.")
         exit(1)
 
-    # Check if theory is implemented in choosen colder.
-    if theory not in SOLVER_THEORY_MAP[solver]:
-        print(f"This theory is not implemented in {solver}")
-        exit(1)
-
-    # number of colors must be power of 2 for some theories.
-    if theory[0] == "S" or theory[0] == "B":
-        power_of_two  = (num_colors <= 0) or (num_colors & (num_colors - 1)) != 0
-        if power_of_two:
-            print("Number of colors must be power of 2")
+    # Check the theory and the number of colors (a power of 2 for some theories).
+    if not race:
+        try:
+            check_reduction(solver, theory, num_colors)
+        except Exception as e:
+            print(f"{e}")
             exit(1)
 
     # rread graph
     try:
         read_time_start = time.time()
-        graph = read_dot(graph_path)
+        graph = read_graph(graph_path)
         read_time_end = time.time()
     except Exception as e:
         print("Error in reading file.")
         print(f"{e}")
+        sys.exit(1)
     
     num_vertices = graph.number_of_nodes()
     num_edges = graph.number_of_edges()
@@ -197,7 +502,7 @@ def args_validation():
         "time" : read_time_end - read_time_start
     }
 
-    reduct_input = (solver, theory, num_colors, graph, ret_mod, no_formula)
+    reduct_input = ReducInput(solver, theory, num_colors, graph, ret_mod, no_formula, skip_smt, race)
     
     return graph_data, timeout, reduct_input
    
@@ -215,15 +520,8 @@ TEXT_COLORS_CLI = {
     "RESET" : '\033[0m'
 }
 
-TEXT_COLORS_FILE = {
-    "RED" : '',
-    "GREEN" : '',
-    "YELLOW" : '',
-    "BLUE" :'',
-    "MAGENTA" : '',
-    "CYAN" : '',
-    "RESET" : ''
-}
+# No escape codes when the output is not a terminal.
+TEXT_COLORS_FILE = dict.fromkeys(TEXT_COLORS_CLI, '')
 
 ROUND_PLACE = 6
 
@@ -231,38 +529,40 @@ if __name__=="__main__":
     
     graph_data, timeout, reduct_input = args_validation()
    
-    result, solution, formula, reduction_time, process_time, total_time = process_with_timeout(reduct_input, timeout)
+    result, solution, formula, reduction_time, process_time, total_time, theory = process_with_timeout(reduct_input, timeout)
     
-    if sys.stdout.isatty():
-        text_color = TEXT_COLORS_CLI
-    else:
-        text_color = TEXT_COLORS_FILE
+    text_color = TEXT_COLORS_CLI if sys.stdout.isatty() else TEXT_COLORS_FILE
+    red, green, yellow, blue, magenta, cyan, reset = (text_color[c] for c in
+                                                      ("RED", "GREEN", "YELLOW", "BLUE", "MAGENTA", "CYAN", "RESET"))
     
     if result == None:
-        print(text_color["RED"] + solution + text_color["RESET"])
+        print(red + solution + reset)
         exit(1)
 
-    if reduct_input[5]:
-        print(text_color["CYAN"] + "\n== Formula ==" + text_color["RESET"])
-        for assertion in formula:
-            print(assertion)
+    if reduct_input.no_formula:
+        print(cyan + "\n== Formula ==" + reset)
+        if formula:
+            # The lines are copied from the file of the worker, the formula is never held in memory.
+            sys.stdout.writelines(formula)
 
-    print(text_color["GREEN"] + "\n== Output ==" + text_color["RESET"])
+    print(green + "\n== Output ==" + reset)
     if result:
         for ass in solution:
             print(ass)
-        print(f"Result: {text_color['GREEN']}Colorable{text_color['RESET']}")
+        print(f"Result: {green}Colorable{reset}")
     else:
-        print(f"Result: {text_color['GREEN']}Not Colorable{text_color['RESET']}")
+        print(f"Result: {green}Not Colorable{reset}")
+    if reduct_input.race:
+        print(f"Winning theory: {magenta}{theory}{reset}")
 
 
 
-    print(text_color["CYAN"] + "\n== Graph Details ==" + text_color["RESET"])
-    print(f"Number of nodes: {text_color['MAGENTA']}{graph_data['V']}{text_color['RESET']}")
-    print(f"Number of edges: {text_color['MAGENTA']}{graph_data['E']}{text_color['RESET']}")
+    print(cyan + "\n== Graph Details ==" + reset)
+    print(f"Number of nodes: {magenta}{graph_data['V']}{reset}")
+    print(f"Number of edges: {magenta}{graph_data['E']}{reset}")
 
-    print(text_color["YELLOW"] + "\n== Performance Timings ==" + text_color["RESET"])
-    print(f"Read file time          : {text_color['BLUE']}{round(graph_data['time'],ROUND_PLACE)} seconds{text_color['RESET']}")
-    print(f"Reduction creation time : {text_color['BLUE']}{round(reduction_time,ROUND_PLACE)} seconds{text_color['RESET']}")
-    print(f"Solving time            : {text_color['BLUE']}{round(process_time,ROUND_PLACE)} seconds{text_color['RESET']}")
-    print(f"Total time              : {text_color['BLUE']}{round(total_time,ROUND_PLACE)} seconds{text_color['RESET']}")
\ No newline at end of file
+    print(yellow + "\n== Performance Timings ==" + reset)
+    print(f"Read file time          : {blue}{graph_data['time']:.{ROUND_PLACE}f} seconds{reset}")
+    print(f"Reduction creation time : {blue}{reduction_time:.{ROUND_PLACE}f} seconds{reset}")
+    print(f"Solving time            : {blue}{process_time:.{ROUND_PLACE}f} seconds{reset}")
+    print(f"Total time              : {blue}{total_time:.{ROUND_PLACE}f} seconds{reset}")
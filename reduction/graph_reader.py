@@ -0,0 +1,109 @@
+"""
+Graph Reader Module
+
+This module reads the input graph from a DOT file. Plain undirected graphs, made only
+of edge statements (a -- b, or chains a -- b -- c) and node statements (a), are
+scanned directly, which avoids the pydot parser. Any other DOT file (attributes,
+subgraphs, digraphs, comments, ...) is read with networkx.drawing.nx_agraph.read_dot
+if pygraphviz is installed, since Graphviz parses DOT in C, and otherwise with
+networkx.drawing.nx_pydot.read_dot.
+
+In both cases the result is a networkx Graph with the node names as strings. Parallel
+edges are merged, since an edge gives the same coloring constraint however often it is listed.
+
+Functions:
+    read_graph: Read a graph from a DOT file.
+
+"""
+
+import re
+import networkx as nx
+
+try:
+    import pygraphviz   # nx_agraph.read_dot needs it.
+    from networkx.drawing.nx_agraph import read_dot
+except ImportError:
+    from networkx.drawing.nx_pydot import read_dot
+
+
+# A node name, a number or identifier, or a quoted string without escapes.
+_NODE_ID = re.compile(r'[A-Za-z0-9_.]+|"[^"\\]*"')
+
+# Header of a plain undirected graph, with an optional name.
+_HEADER = re.compile(r'\s*graph\s*([A-Za-z0-9_.]+|"[^"\\]*")?\s*', re.IGNORECASE)
+
+# Words that start attribute or subgraph statements, never plain node names.
+_KEYWORDS = {"node", "edge", "graph", "digraph", "subgraph", "strict"}
+
+
+
+def _scan_plain_dot(text):
+    """
+    Scan the nodes and edges of a plain undirected DOT graph.
+
+    Args:
+        text (str): The content of the DOT file.
+
+    Returns:
+        tuple or None: A tuple containing (nodes, edges), the names of the node statements
+                       and the (u, v) pairs of the edge statements in file order, or None if
+                       the text is not a plain graph.
+    """
+    if "/*" in text or "//" in text or "#" in text:
+        return None
+
+    start = text.find("{")
+    end = text.rfind("}")
+    if start < 0 or end < start or text[end + 1:].strip() or not _HEADER.fullmatch(text[:start]):
+        return None
+
+    nodes = []
+    edges = []
+    for statement in re.split(r"[;\n]", text[start + 1:end]):
+        statement = statement.strip()
+        if not statement:
+            continue
+
+        names = []
+        for part in statement.split("--"):
+            part = part.strip()
+            if not _NODE_ID.fullmatch(part) or part.lower() in _KEYWORDS:
+                return None
+            names.append(part.strip('"'))
+
+        if len(names) == 1:
+            nodes.append(names[0])
+        else:
+            edges.extend(zip(names, names[1:]))
+
+    return nodes, edges
+
+
+
+def read_graph(graph_path):
+    """
+    Read a graph from a DOT file.
+
+    Args:
+        graph_path (str): The path to the DOT file.
+
+    Returns:
+        networkx.Graph: The graph, the same as networkx.Graph(read_dot(graph_path)) for a plain
+                        graph, without the graph attributes.
+
+    Raises:
+        Exception: If the file cannot be read or parsed.
+    """
+    with open(graph_path) as f:
+        text = f.read()
+
+    scanned = _scan_plain_dot(text)
+    if scanned is None:
+        return nx.Graph(read_dot(graph_path))
+
+    nodes, edges = scanned
+    graph = nx.Graph()
+    # Same order as read_dot, node statements first and then the nodes of the edges.
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    return graph
@@ -0,0 +1,196 @@
+"""
+Portfolio Module
+
+This module solves the k-coloring problem for one graph with several theory
+encodings of one solver (cvc5 by default) at the same time. Since the encodings are independent
+satisfiability queries and the fastest one varies between instances, the
+verdict of the first encoding that finishes is returned and the other workers
+are terminated.
+
+It also solves sweeps, many (solver, theory, number of colors) queries on one graph,
+with a pool of workers that is started once for the whole sweep.
+
+Functions:
+    solve_portfolio: Race several theory encodings and return the first verdict.
+    solve_sweep: Solve many queries on one graph in parallel and return all the verdicts.
+
+"""
+
+import os
+import pickle
+import signal
+from functools import partial
+from multiprocessing import Pool
+from pysmt.shortcuts import reset_env
+from reduction import create_reduction, check_reduction
+
+
+PORTFOLIO_THEORIES = ("LIA", "AUF", "NLA", "BV")
+
+# Graph of the worker process, set once by the pool initializer.
+_worker_graph = None
+
+
+def _init_worker(graph_bytes):
+    """
+    Load the graph in a portfolio worker process.
+
+    Args:
+        graph_bytes (bytes): The pickled graph, serialized once by the parent process.
+    """
+    global _worker_graph
+    _worker_graph = pickle.loads(graph_bytes)
+    # The parent may stop itself on SIGTERM (see __main__._worker_loop), the pool stops its workers with it.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def _solve_theory(job):
+    """
+    Create a reduction for one theory and solve it.
+
+    Every worker builds its own Solver inside create_reduction, since solvers
+    cannot be shared between processes.
+
+    Args:
+        job (tuple): A tuple containing (solver, theory, num_colors, search_model, timeout).
+
+    Returns:
+        tuple: A tuple containing (theory, result, solution), where solution is
+               a dictionary mapping nodes to colors or None if no model was requested.
+
+    Raises:
+        TimeoutError: If the solver reached the time limit.
+    """
+    solver, theory, num_colors, search_model, timeout = job
+    # A worker may get a second job, pySMT symbols of the previous theory must not be reused.
+    reset_env()
+    graph_enc = create_reduction(solver, theory, num_colors, _worker_graph, search_model, timeout=timeout)
+
+    result = graph_enc.solve()
+    solution = None
+    if result and search_model:
+        # Colors are sent back as plain integers (pySMT may return gmpy numbers).
+        solution = {n: int(c) for n, c in graph_enc.get_solution().items()}
+
+    return theory, result, solution
+
+
+def solve_portfolio(graph, num_colors, theories = PORTFOLIO_THEORIES, search_model = True, solver = "cvc5",
+                    timeout = 0):
+    """
+    Solve the k-coloring problem by racing several encodings in parallel.
+
+    Each theory runs in its own worker process. The first worker to return a
+    verdict wins and the remaining workers are terminated. Theories that work
+    only with a power of 2 number of colors (BV and Sets) are skipped otherwise.
+
+    Args:
+        graph: The graph to be colored.
+        num_colors (int): The number of colors to use.
+        theories (iterable): The theories to race, all of them must be supported by the
+                             solver (see reduction.SOLVER_THEORY_MAP). Defaults to LIA, AUF, NLA and BV.
+        search_model (bool): Whether to return a solution. Defaults to True.
+        solver (str): The name of the solver of all the encodings. Defaults to "cvc5".
+        timeout (int): The time limit of every encoding in seconds, enforced by the solver
+                       (see reduction.create_reduction). 0 for no limit. Defaults to 0.
+
+    Returns:
+        tuple: A tuple containing (theory, result, solution) of the first
+               encoding that finished.
+
+    Raises:
+        Exception: If none of the theories can be used with the given number of colors.
+        Exception: If all the workers failed, the last error is raised
+                   (TimeoutError if all of them reached the time limit).
+    """
+    power_of_two = num_colors > 0 and (num_colors & (num_colors - 1)) == 0
+    jobs = [(solver, t, num_colors, search_model, timeout) for t in theories
+            if power_of_two or t[0] not in ("S", "B")]
+    if not jobs:
+        raise Exception("No theory in the portfolio supports this number of colors.")
+
+    # Pickle the graph once, the workers receive it through the initializer.
+    pool = Pool(len(jobs), initializer=_init_worker, initargs=(pickle.dumps(graph),))
+    try:
+        results = pool.imap_unordered(_solve_theory, jobs)
+        error = None
+        for _ in jobs:
+            try:
+                return next(results)
+            except Exception as e:
+                error = e
+        raise error
+    finally:
+        # First finisher wins, stop the rest of the encodings.
+        pool.terminate()
+        pool.join()
+
+
+def _solve_sweep_job(job, timeout, search_model):
+    """
+    Create a reduction for one query of a sweep and solve it.
+
+    Args:
+        job (tuple): A tuple containing (solver, theory, num_colors).
+        timeout (int): The time limit of the solver in seconds, 0 for none.
+        search_model (bool): Whether to return a solution.
+
+    Returns:
+        tuple: A tuple containing (solver, theory, num_colors, result, solution), where result
+               is None if the solver reached the time limit.
+    """
+    solver, theory, num_colors = job
+    # pySMT symbols of the previous job of the worker must not be reused.
+    reset_env()
+    graph_enc = create_reduction(solver, theory, num_colors, _worker_graph, search_model, timeout=timeout)
+
+    try:
+        result = graph_enc.solve()
+    except TimeoutError:
+        return solver, theory, num_colors, None, None
+
+    solution = None
+    if result and search_model:
+        solution = {n: int(c) for n, c in graph_enc.get_solution().items()}
+
+    return solver, theory, num_colors, result, solution
+
+
+def solve_sweep(graph, jobs, timeout = 0, search_model = False, processes = None):
+    """
+    Solve many k-coloring queries on one graph in parallel.
+
+    The graph is pickled once and loaded by every worker when the pool starts
+    (see _init_worker), and the workers are reused for all the queries, so a
+    sweep does not start a process or send the graph per query. The queries
+    are checked with reduction.check_reduction before the pool is started.
+
+    Args:
+        graph: The graph to be colored.
+        jobs (iterable): The queries, (solver, theory, num_colors) tuples.
+        timeout (int): The time limit of every query in seconds, enforced by the solver
+                       (see reduction.create_reduction). 0 for no limit. Defaults to 0.
+        search_model (bool): Whether to return the solutions. Defaults to False.
+        processes (int): The number of workers. Defaults to the number of CPUs.
+
+    Returns:
+        list: A (solver, theory, num_colors, result, solution) tuple per query, in the order
+              of jobs. result is None if the solver reached the time limit.
+
+    Raises:
+        Exception: If a query is not valid, see reduction.check_reduction.
+        Exception: Any exception raised by a worker.
+    """
+    jobs = list(jobs)
+    for solver, theory, num_colors in jobs:
+        check_reduction(solver, theory, num_colors)
+    if not jobs:
+        return []
+
+    processes = min(len(jobs), processes or os.cpu_count() or 1)
+    pool = Pool(processes, initializer=_init_worker, initargs=(pickle.dumps(graph),))
+    try:
+        return list(pool.imap(partial(_solve_sweep_job, timeout=timeout, search_model=search_model), jobs))
+    finally:
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,125 @@
+"""
+Presolve Module
+
+This module tries to k-color a graph with the DSATUR heuristic before any
+formula is built. If the heuristic finds a coloring the instance is solved,
+otherwise nothing is decided and the SMT solver is called as usual.
+
+The heuristic runs on the graph in CSR form (neighbor offsets and neighbor
+indices as flat integer arrays), with the colors of the neighbors of every
+vertex stored as a bit mask. If numba is installed, the kernel is compiled
+with numba.njit, otherwise the same code runs as plain Python.
+
+Functions:
+    dsatur_coloring: Try to color a graph with k colors using DSATUR.
+
+"""
+
+import heapq
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+
+# Colors are bits of one signed 64-bit mask per vertex, the sign bit is not used.
+MAX_COLORS = 63
+
+
+
+def _dsatur(n, indptr, indices, k, colors, saturation, used):
+    """
+    Color the vertices in DSATUR order, stop at the first vertex with no free color.
+
+    The next vertex is the uncolored vertex with the most distinct neighbor colors,
+    ties are broken by degree. Stale heap entries are skipped when popped.
+
+    Args:
+        n (int): The number of vertices.
+        indptr: The neighbors of vertex v are indices[indptr[v]:indptr[v+1]].
+        indices: The concatenated neighbor lists.
+        k (int): The number of colors, at most MAX_COLORS.
+        colors: Output array of n colors, initialized to -1.
+        saturation: Array of n zeros, the number of distinct neighbor colors.
+        used: Array of n zero masks, bit c is set if a neighbor has color c.
+              Masks, shifts and colors are all 64-bit signed integers under numba.
+
+    Returns:
+        int: The number of colored vertices, n if the coloring succeeded.
+    """
+    heap = [(0, indptr[v] - indptr[v + 1], v) for v in range(n)]
+    heapq.heapify(heap)
+
+    colored = 0
+    while len(heap) > 0:
+        neg_sat, neg_deg, v = heapq.heappop(heap)
+        if colors[v] >= 0 or -neg_sat != saturation[v]:
+            continue
+
+        mask = used[v]
+        c = 0
+        while c < k and (mask >> c) & 1:
+            c += 1
+        if c == k:
+            return colored
+
+        colors[v] = c
+        colored += 1
+        bit = 1 << c
+        for j in range(indptr[v], indptr[v + 1]):
+            u = indices[j]
+            if colors[u] < 0 and not (used[u] & bit):
+                used[u] |= bit
+                saturation[u] += 1
+                heapq.heappush(heap, (-saturation[u], indptr[u] - indptr[u + 1], u))
+    return colored
+
+
+if njit is not None:
+    _dsatur_kernel = njit(cache=True)(_dsatur)
+
+
+
+def dsatur_coloring(graph, k):
+    """
+    Try to color the graph with k colors using the DSATUR heuristic.
+
+    DSATUR is not exact, a None result does not mean that the graph is not
+    k-colorable.
+
+    Args:
+        graph: The graph to be colored, without self-loops.
+        k (int): The number of colors.
+
+    Returns:
+        dict or None: A dictionary mapping nodes to colors (0 ... k-1) if a
+                      coloring was found, None otherwise or if k > MAX_COLORS.
+    """
+    if k < 1 or k > MAX_COLORS:
+        return None
+
+    nodes = list(graph.nodes())
+    n = len(nodes)
+    index = {v: i for i, v in enumerate(nodes)}
+
+    # CSR adjacency, parallel edges are merged by graph.adj.
+    indptr = [0]
+    indices = []
+    for v in nodes:
+        indices.extend(index[u] for u in graph.adj[v])
+        indptr.append(len(indices))
+
+    if njit is not None:
+        colors = np.full(n, -1, dtype=np.int64)
+        colored = _dsatur_kernel(n, np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64),
+                                 k, colors, np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64))
+    else:
+        colors = [-1] * n
+        colored = _dsatur(n, indptr, indices, k, colors, [0] * n, [0] * n)
+
+    if colored < n:
+        return None
+    return {v: int(colors[i]) for i, v in enumerate(nodes)}
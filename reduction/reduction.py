@@ -1,41 +1,77 @@
-from cvc5 import Solver as cvc5_solver
+import networkx as nx
 from pysmt.shortcuts import Solver as pysmt_solver
 import ColorerPySMT
-import ColorerCVC5
 import GraphEncPySMT
-import GraphEncCVC5
 
 
 
 
+# Colorer class of every theory, per solver interface. The cvc5 classes are named, not
+# imported, so the pySMT solvers work where cvc5 is not installed (e.g. PyPy), see create_cvc5.
+_CVC5_COLORERS = {
+    "LIA" : "LIAColorerCVC5",
+    "NLA" : "NLAColorerCVC5",
+    "PNLA" : "ProductNLAColorerCVC5",
+    "AUF" : "ArrayUFColorerCVC5",
+    "AINT" : "ArrayINTColorerCVC5",
+    "ABV" : "ArrayBVColorerCVC5",
+    "BV" : "BVColorerCVC5",
+    "SUF" : "SetUFColorerCVC5",
+    "SINT" : "SetINTColorerCVC5",
+    "SBV" : "SetBVColorerCVC5",
+  }
+
+_PYSMT_COLORERS = {
+    "LIA" : ColorerPySMT.LIAColorerPySMT,
+    "NLA" : ColorerPySMT.NLAColorerPySMT,
+    "AUF" : ColorerPySMT.ArrayUFColorerPySMT,
+    "AINT" : ColorerPySMT.ArrayINTColorerPySMT,
+    "ABV" : ColorerPySMT.ArrayBVColorerPySMT,
+    "BV" : ColorerPySMT.BVColorerPySMT,
+  }
+
+# Theories of every solver, fixed at import time.
 SOLVER_THEORY_MAP = {
-    "msat" : {"LIA", "AUF", "AINT", "ABV", "BV"},
-    "z3": {"LIA", "NLA", "AUF", "AINT", "ABV", "BV"},
-    "yices": {"LIA"}, 
-    "btor" : {"BV", "ABV"}, 
-    "cvc5" : {"LIA", "NLA", "AUF", "AINT", "ABV", "BV", "SUF", "SINT", "SBV"},
+    "msat" : frozenset({"LIA", "AUF", "AINT", "ABV", "BV"}),
+    "z3": frozenset({"LIA", "NLA", "AUF", "AINT", "ABV", "BV"}),
+    "yices": frozenset({"LIA"}),
+    "btor" : frozenset({"BV", "ABV"}),
+    "cvc5" : frozenset(_CVC5_COLORERS),
   }
 
 
-def create_reduction(solver, theory, k, graph, search_model = True):
+def check_num_colors(theory, k):
     """
-    Create a graph encoding reduction based on the specified solver and theory.
+    Check that the number of colors can be encoded in the theory.
+
+    Bit-vector and Set theories (names starting with "B" or "S") need a power of 2.
 
     Args:
-        solver (str): The name of the solver to use.
         theory (str): The theory to use for graph coloring.
         k (int): The number of colors to use.
-        graph: The graph to be colored.
 
-    Returns:
-        GraphEnc: An instance of either GraphEncCVC5 or GraphEncPySMT.
+    Raises:
+        Exception: If the number of colors is not a power of 2 for these theories.
+    """
+    if theory[0] in ("S", "B") and (k <= 0 or k & (k - 1)):
+        raise Exception("Number of colors must be power of 2")
+
+
+
+def check_reduction(solver, theory, k):
+    """
+    Check that a reduction can be created for the solver, theory and number of colors.
+
+    Args:
+        solver (str): The name of the solver to use.
+        theory (str): The theory to use for graph coloring.
+        k (int): The number of colors to use.
 
     Raises:
         Exception: If an invalid solver is specified.
         NotImplementedError: If the specified theory is not implemented for the given solver.
         Exception: If the number of colors is not a power of 2 for certain theories.
     """
-
     # Check if solver is legit.
     if solver not in SOLVER_THEORY_MAP:
         raise Exception("Wrong value for solver.")
@@ -44,66 +80,119 @@ def create_reduction(solver, theory, k, graph, search_model = True):
     if theory not in SOLVER_THEORY_MAP[solver]:
         raise NotImplementedError(f"This theory is not implemented in {solver}")
 
-    # Check that for BV or Sets k is power of 2.
-    if theory[0] == "S" or theory[0] == "B":
-        power_of_two  = (k <= 0) or (k & (k - 1)) != 0
-        if power_of_two:
-            raise Exception("Number of colors must be power of 2")
-    
+    check_num_colors(theory, k)
+
+
+
+def create_reduction(solver, theory, k, graph, search_model = True, solver_instance = None, unsat_cores = False,
+                     skip_smt = False, reuse_solver = False, validate = True, timeout = 0):
+    """
+    Create a graph encoding reduction based on the specified solver and theory.
+
+    Args:
+        solver (str): The name of the solver to use.
+        theory (str): The theory to use for graph coloring.
+        k (int): The number of colors to use.
+        graph: The graph to be colored. Multigraphs and directed graphs are converted to
+               a networkx.Graph, parallel edges and edge directions do not change the coloring.
+        search_model (bool): Whether to produce models. Defaults to True.
+        solver_instance: An existing pySMT solver to reuse, its previous encoding must be
+                         released (see GraphEncPySMT.release). Ignored for cvc5. Defaults to None.
+        unsat_cores (bool): Whether cvc5 caches UNSAT cores to skip solving graphs that
+                            contain a known UNSAT subgraph. Ignored for pySMT. Defaults to False.
+        skip_smt (bool): Whether easy instances are colored without the solver,
+                         see GraphEnc.trivial_solution. Defaults to False.
+        reuse_solver (bool): Whether cvc5 takes an idle solver from GraphEncCVC5.SOLVER_POOL,
+                             see create_cvc5. Ignored for pySMT. Defaults to False.
+        validate (bool): Whether the arguments are checked with check_reduction. Callers that
+                         already checked them may pass False. Defaults to True.
+        timeout (int): A time limit in seconds for every satisfiability check, enforced by the
+                       solver itself (cvc5 and z3 only). 0 for no limit. Defaults to 0.
+
+    Returns:
+        GraphEnc: An instance of either GraphEncCVC5 or GraphEncPySMT.
+
+    Raises:
+        Exception: If an invalid solver is specified.
+        NotImplementedError: If the specified theory is not implemented for the given solver.
+        Exception: If the number of colors is not a power of 2 for certain theories.
+    """
+    if validate:
+        check_reduction(solver, theory, k)
+
+    if graph.is_multigraph() or graph.is_directed():
+        graph = nx.Graph(graph)
+
     if solver == "cvc5":
-        graph_enc = create_cvc5(theory, k, graph, search_model)
+        graph_enc = create_cvc5(theory, k, graph, search_model, unsat_cores, reuse_solver, timeout)
 
     else:
-        graph_enc = create_pysmt(solver,theory, k, graph)
-    
+        graph_enc = create_pysmt(solver,theory, k, graph, solver_instance, timeout)
+
+    graph_enc.skip_smt = skip_smt
+    graph_enc.timeout = timeout
     return graph_enc
 
 
 
-def create_cvc5(theory, k, graph, search_model = True):
+def create_cvc5(theory, k, graph, search_model = True, unsat_cores = False, reuse_solver = False, timeout = 0):
     """
     Create a CVC5-based graph encoding.
 
+    With reuse_solver, the encoding is built in a new assertion level of an idle
+    solver with the same options from GraphEncCVC5.SOLVER_POOL, instead of a new
+    solver. GraphEncCVC5.release() pops the level and returns the solver to the pool.
+    A solver is not shared by two unreleased encodings. The colorer memo
+    (ColorerCVC5.new_solver_memo) stays with a pooled solver, so the color constraints
+    of a graph are built once per solver.
+    cvc5 is imported only here, the first time a cvc5 reduction is created.
+
     Args:
         theory (str): The theory to use for graph coloring.
         k (int): The number of colors to use.
         graph: The graph to be colored.
         search_model (bool): Whether to produce models. Defaults to True.
+        unsat_cores (bool): Whether to cache UNSAT cores. Defaults to False.
+        reuse_solver (bool): Whether to reuse a pooled solver. Defaults to False.
+        timeout (int): The time limit of every checkSat in seconds (the cvc5 "tlimit-per" option),
+                       0 for no limit. Defaults to 0.
 
     Returns:
         GraphEncCVC5: An instance of GraphEncCVC5 with the appropriate colorer.
     """
-    solver = cvc5_solver()
-    if search_model:
-        solver.setOption("produce-models", "true")
-    
-    if theory == "LIA":
-        colorer = ColorerCVC5.LIAColorerCVC5(k, solver)
-    elif theory == "NLA":
-        colorer = ColorerCVC5.NLAColorerCVC5(k, solver)
-    elif theory == "AUF":
-        colorer = ColorerCVC5.ArrayUFColorerCVC5(k, solver)
-    elif theory == "AINT":
-        colorer = ColorerCVC5.ArrayINTColorerCVC5(k, solver)
-    elif theory == "ABV":
-        colorer = ColorerCVC5.ArrayBVColorerCVC5(k, solver)
-    elif theory == "BV":
-        colorer = ColorerCVC5.BVColorerCVC5(k, solver)
-    elif theory == "SUF":
-        colorer = ColorerCVC5.SetUFColorerCVC5(k, solver)
-    elif theory == "SINT":
-        colorer = ColorerCVC5.SetINTColorerCVC5(k, solver)
-    elif theory == "SBV":
-        colorer = ColorerCVC5.SetBVColorerCVC5(k, solver)
+    from cvc5 import Solver as cvc5_solver
+    import ColorerCVC5
+    import GraphEncCVC5
+
+    pool_key = (theory, search_model, unsat_cores, timeout)
+    solver, memo = GraphEncCVC5.SOLVER_POOL.pop(pool_key, (None, None)) if reuse_solver else (None, None)
+
+    if solver is None:
+        solver = cvc5_solver()
+        if search_model:
+            solver.setOption("produce-models", "true")
+        if unsat_cores:
+            solver.setOption("produce-unsat-cores", "true")
+        else:
+            # Assertions are never read back from the solver (on by default in cvc5).
+            solver.setOption("produce-assertions", "false")
+        if timeout:
+            solver.setOption("tlimit-per", str(timeout * 1000))
+    if reuse_solver:
+        solver.push()
     
-    graph_enc = GraphEncCVC5.GraphEncCVC5(graph, colorer, solver)
+    colorer = getattr(ColorerCVC5, _CVC5_COLORERS[theory])(k, solver, memo)
+
+    graph_enc = GraphEncCVC5.GraphEncCVC5(graph, colorer, solver, unsat_cores)
+    if reuse_solver:
+        graph_enc.pool_key = pool_key
 
     return graph_enc
 
 
 
 
-def  create_pysmt(solver_name, theory,k, graph):
+def  create_pysmt(solver_name, theory,k, graph, solver = None, timeout = 0):
     """
     Create a pySMT-based graph encoding.
 
@@ -112,23 +201,17 @@ def  create_pysmt(solver_name, theory,k, graph):
         theory (str): The theory to use for graph coloring.
         k (int): The number of colors to use.
         graph: The graph to be colored.
+        solver: An existing pySMT solver to reuse. If None a new solver is created. Defaults to None.
+        timeout (int): The time limit of every check in seconds for a new z3 solver, 0 for no limit.
+                       The other pySMT solvers have no time limit option. Defaults to 0.
 
     Returns:
         GraphEncPySMT: An instance of GraphEncPySMT with the appropriate colorer.
     """
-    solver = pysmt_solver(name=solver_name)
-    if theory == "LIA":
-        colorer = ColorerPySMT.LIAColorerPySMT(k)
-    elif theory == "NLA":
-        colorer = ColorerPySMT.NLAColorerPySMT(k)
-    elif theory == "AUF":
-        colorer = ColorerPySMT.ArrayUFColorerPySMT(k)
-    elif theory == "AINT":
-        colorer = ColorerPySMT.ArrayINTColorerPySMT(k)
-    elif theory == "ABV":
-        colorer = ColorerPySMT.ArrayBVColorerPySMT(k)
-    elif theory == "BV":
-        colorer = ColorerPySMT.BVColorerPySMT(k)
+    if solver is None:
+        options = {"timeout": timeout * 1000} if timeout and solver_name == "z3" else {}
+        solver = pysmt_solver(name=solver_name, solver_options=options)
+    colorer = _PYSMT_COLORERS[theory](k)
 
     graph_enc = GraphEncPySMT.GraphEncPySMT(graph, colorer, solver)
     return graph_enc
@@ -0,0 +1,9 @@
+#!/bin/sh
+# Run the tool with PyPy, the pySMT formula construction is pure Python and
+# runs considerably faster under a JIT. cvc5 does not build for PyPy, use the
+# pySMT solvers (e.g. z3, msat, yices) with this script.
+#
+# Usage: ./run_under_pypy.sh <path-to-dot-file> <number-of-colors> <solver-name> <theory-name> [flags]
+
+PYPY="${PYPY:-pypy3}"
+exec "$PYPY" "$(dirname "$0")/reduction" "$@"
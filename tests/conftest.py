@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The modules of the tool import each other by name, as when it is run with
+# "python reduction" (or with PYTHONPATH=reduction, see the Dockerfile).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reduction"))
@@ -0,0 +1,56 @@
+import networkx as nx
+from pysmt.shortcuts import reset_env
+
+from reduction import create_reduction
+
+
+def test_trivial_solution_uses_colors_of_the_encoding():
+    reset_env()
+    lia = create_reduction("z3", "LIA", 3, nx.empty_graph(3), skip_smt=True)
+    reset_env()
+    aint = create_reduction("z3", "AINT", 3, nx.empty_graph(3), skip_smt=True)
+
+    assert lia.trivial_solution() == {0: 0, 1: 0, 2: 0}
+    # The array colors of ArrayINT are 1 ... k.
+    assert aint.trivial_solution() == {0: 1, 1: 1, 2: 1}
+
+
+def trivial(graph, k, theory = "LIA"):
+    reset_env()
+    return create_reduction("z3", theory, k, graph, skip_smt=True).trivial_solution()
+
+
+def assert_valid_coloring(graph, coloring, k):
+    assert set(coloring) == set(graph.nodes())
+    assert all(0 <= c < k for c in coloring.values())
+    assert all(coloring[u] != coloring[v] for u, v in graph.edges())
+
+
+def test_trivial_solution_of_easy_graphs():
+    # Maximum degree smaller than k.
+    assert_valid_coloring(nx.petersen_graph(), trivial(nx.petersen_graph(), 4), 4)
+    # Bipartite.
+    assert_valid_coloring(nx.grid_2d_graph(4, 4), trivial(nx.grid_2d_graph(4, 4), 3), 3)
+    # Colored by DSATUR.
+    assert_valid_coloring(nx.wheel_graph(7), trivial(nx.wheel_graph(7), 3), 3)
+
+
+def test_trivial_solution_gives_up():
+    assert trivial(nx.complete_graph(5), 4) is None
+    # The shortcut is opt-in.
+    reset_env()
+    assert create_reduction("z3", "LIA", 4, nx.petersen_graph()).trivial_solution() is None
+
+    graph = nx.path_graph(3)
+    graph.add_edge(1, 1)
+    assert trivial(graph, 3) is None
+
+
+def test_trivial_solution_is_used_by_solve():
+    reset_env()
+    graph_enc = create_reduction("z3", "LIA", 3, nx.petersen_graph(), skip_smt=True)
+
+    assert graph_enc.solve()
+    assert graph_enc.get_solution() == graph_enc.trivial_solution()
+    # The formula was not built.
+    assert graph_enc._cached_formula is None
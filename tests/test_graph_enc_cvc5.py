@@ -0,0 +1,84 @@
+import networkx as nx
+import pytest
+
+pytest.importorskip("cvc5")
+
+from reduction import create_reduction
+
+
+def test_grouped_assertions_with_isolated_nodes():
+    graph = nx.Graph([(1, 2), (2, 3)])
+    graph.add_nodes_from([4, 5, 6])
+    graph_enc = create_reduction("cvc5", "LIA", 3, graph, skip_smt=False)
+
+    grouped = graph_enc.get_formula_assertions_grouped()
+
+    # One bound term per connected vertex, then the 2 edges and the symmetry constraint.
+    assert len(grouped) == 3 + 2 + 1
+    assert all(a.startswith("(and ") for a in grouped[:3])
+    assert all(a.startswith("(distinct ") for a in grouped[3:5])
+    assert graph_enc.solve()
+
+
+def test_grouped_assertions_do_not_change_the_formula():
+    graph_enc = create_reduction("cvc5", "LIA", 3, nx.cycle_graph(5), skip_smt=False)
+    assertions = graph_enc.get_formula_assertions()
+
+    grouped = graph_enc.get_formula_assertions_grouped()
+
+    assert len(assertions) == 2 * 5 + 5 + 1
+    assert len(grouped) == 5 + 5 + 1
+    assert graph_enc.get_formula_assertions() == assertions
+    assert graph_enc.solve()
+
+
+def test_grouped_assertions_of_other_theories_are_not_grouped():
+    graph_enc = create_reduction("cvc5", "NLA", 3, nx.cycle_graph(5), skip_smt=False)
+
+    assert graph_enc.get_formula_assertions_grouped() == graph_enc.get_formula_assertions()
+
+
+def test_unsat_core_skips_graphs_that_contain_it(monkeypatch):
+    import GraphEncCVC5
+    monkeypatch.setattr(GraphEncCVC5, "_UNSAT_EDGE_CORES", {})
+
+    first = create_reduction("cvc5", "LIA", 3, nx.complete_graph(4), skip_smt=False, unsat_cores=True)
+    assert not first.solve()
+    assert len(GraphEncCVC5._UNSAT_EDGE_CORES[3]) == 1
+
+    # A K4 with a pendant vertex, in another theory, is UNSAT without calling the solver.
+    graph = nx.complete_graph(4)
+    graph.add_edge(3, 4)
+    second = create_reduction("cvc5", "AUF", 3, graph, skip_smt=False, unsat_cores=True)
+    assert not second.solve()
+    assert not second._asserted
+
+    # A colorable graph is still solved.
+    third = create_reduction("cvc5", "LIA", 3, nx.cycle_graph(4), skip_smt=False, unsat_cores=True)
+    assert third.solve()
+
+
+def test_unsat_cores_are_bounded(monkeypatch):
+    import GraphEncCVC5
+    monkeypatch.setattr(GraphEncCVC5, "_UNSAT_EDGE_CORES", {})
+    monkeypatch.setattr(GraphEncCVC5, "UNSAT_CORES_SIZE", 2)
+
+    # Disjoint K3s, none contains the core of another.
+    for i in range(3):
+        graph = nx.relabel_nodes(nx.complete_graph(3), lambda v: 3 * i + v)
+        assert not create_reduction("cvc5", "LIA", 2, graph, skip_smt=False, unsat_cores=True).solve()
+    assert len(GraphEncCVC5._UNSAT_EDGE_CORES[2]) == 2
+
+
+def test_get_solution_reads_the_model_of_solve():
+    graph = nx.cycle_graph(5)
+    graph_enc = create_reduction("cvc5", "LIA", 3, graph, skip_smt=False, timeout=10)
+    assert graph_enc.solve()
+
+    def check_again():
+        raise TimeoutError("The solver reached the time limit.")
+
+    # A second check could stop at the time limit, the model of solve() is read instead.
+    graph_enc._check = check_again
+    solution = graph_enc.get_solution()
+    assert all(solution[u] != solution[v] for u, v in graph.edges())
@@ -0,0 +1,28 @@
+import networkx as nx
+from pysmt.shortcuts import reset_env
+
+from reduction import create_reduction
+
+
+def test_try_k_finds_the_chromatic_number():
+    reset_env()
+    # The core symbols must not clash with the bit-vector symbols of the colorer.
+    graph_enc = create_reduction("z3", "BV", 4, nx.wheel_graph(6), skip_smt=False)
+    assert graph_enc.solve()
+
+    assert [graph_enc.try_k(k) for k in (2, 3, 4)] == [False, False, True]
+
+    graph_enc.release()
+    assert graph_enc.solver.assertions == []
+
+
+def test_get_solution_after_try_k_solves_again():
+    reset_env()
+    graph = nx.cycle_graph(5)
+    graph_enc = create_reduction("z3", "LIA", 3, graph, skip_smt=False)
+    assert graph_enc.solve()
+    assert not graph_enc.try_k(2)
+
+    solution = graph_enc.get_solution()
+    assert all(solution[u] != solution[v] for u, v in graph.edges())
+    graph_enc.release()
@@ -0,0 +1,39 @@
+import networkx as nx
+from networkx.drawing.nx_pydot import read_dot
+
+from graph_reader import read_graph
+
+
+def test_plain_dot_is_scanned(tmp_path):
+    path = tmp_path / "plain.dot"
+    path.write_text('graph G {\n    1 -- 2;\n    2 -- 3 -- 1;\n    2 -- 1;\n    "a b";\n    4\n}\n')
+
+    graph = read_graph(path)
+
+    assert isinstance(graph, nx.Graph) and not graph.is_multigraph()
+    assert list(graph.nodes()) == ["a b", "4", "1", "2", "3"]
+    # The parallel edge 2 -- 1 is merged.
+    assert graph.number_of_edges() == 3
+    assert nx.utils.edges_equal(graph.edges(), nx.Graph(read_dot(path)).edges())
+
+
+def test_other_dot_files_are_read_with_read_dot(tmp_path):
+    path = tmp_path / "attributes.dot"
+    path.write_text('graph {\n    node [shape=circle];\n    1 -- 2 [color=red];\n    2 -- 3;\n    2 -- 3;\n}\n')
+
+    graph = read_graph(path)
+
+    assert not graph.is_multigraph()
+    assert set(graph.nodes()) == {"1", "2", "3"}
+    assert graph.number_of_edges() == 2
+    assert graph.edges["1", "2"]["color"] == "red"
+
+
+def test_directed_dot_files_are_undirected(tmp_path):
+    path = tmp_path / "directed.dot"
+    path.write_text('digraph {\n    1 -> 2;\n    2 -> 1;\n    2 -> 3;\n}\n')
+
+    graph = read_graph(path)
+
+    assert not graph.is_directed()
+    assert graph.number_of_edges() == 2
@@ -0,0 +1,50 @@
+import importlib.util
+import os
+import sys
+import time
+
+import networkx as nx
+
+# The command line module is reduction/__main__.py, loaded under another name.
+_spec = importlib.util.spec_from_file_location(
+    "reduction_main", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reduction", "__main__.py"))
+reduction_main = importlib.util.module_from_spec(_spec)
+# Registered, so its inputs are pickled for the worker process.
+sys.modules["reduction_main"] = reduction_main
+_spec.loader.exec_module(reduction_main)
+
+
+def hang_on_zero_colors(reduc_input, formula_path = None, timeout = 0):
+    # Stands in for a solver that ignores its time limit.
+    if reduc_input.num_colors == 0:
+        time.sleep(60)
+    return True, [], None, 0.0, 0.0, 0.0, reduc_input.theory
+
+
+def test_hung_worker_is_replaced_by_the_next_call(monkeypatch):
+    # The worker is forked, so it runs the patched create_and_solve.
+    monkeypatch.setattr(reduction_main, "create_and_solve", hang_on_zero_colors)
+    monkeypatch.setattr(reduction_main, "_KILL_GRACE", 0)
+    graph = nx.path_graph(3)
+    hung = reduction_main.ReducInput("z3", "LIA", 0, graph, False, False, False, False)
+    try:
+        first = reduction_main._get_worker(graph)[0]
+        assert reduction_main.process_with_timeout(hung, 1)[1] == "Timeout."
+        assert reduction_main._worker is None
+        assert not first.is_alive()
+
+        result = reduction_main.process_with_timeout(hung._replace(num_colors=3), 1)
+        assert result == (True, [], None, 0.0, 0.0, 0.0, "LIA")
+        assert reduction_main._worker[0] is not first
+    finally:
+        reduction_main._stop_worker()
+
+
+def test_format_solution_sorts_numeric_names_first():
+    solution = {"10": 2, "b": 0, "2": 1, "a": 3, "1": 0}
+
+    assert reduction_main.format_solution(solution) == ["1: 0", "2: 1", "10: 2", "a: 3", "b: 0"]
+
+
+def test_format_solution_of_empty_solution():
+    assert reduction_main.format_solution({}) == []
@@ -0,0 +1,22 @@
+import networkx as nx
+
+from portfolio import solve_portfolio, solve_sweep
+
+
+def test_solve_sweep_returns_a_verdict_per_query_in_order():
+    jobs = [("z3", "LIA", 3), ("z3", "LIA", 4), ("z3", "BV", 4), ("z3", "AINT", 3)]
+
+    results = solve_sweep(nx.complete_graph(4), jobs, search_model=True, processes=2)
+
+    assert [r[:4] for r in results] == [("z3", "LIA", 3, False), ("z3", "LIA", 4, True),
+                                        ("z3", "BV", 4, True), ("z3", "AINT", 3, False)]
+    solution = results[1][4]
+    assert all(solution[u] != solution[v] for u, v in nx.complete_graph(4).edges())
+
+
+def test_solve_portfolio_returns_the_verdict_of_a_theory():
+    theory, result, solution = solve_portfolio(nx.cycle_graph(5), 3, ("LIA", "AUF"), solver="z3")
+
+    assert theory in ("LIA", "AUF")
+    assert result
+    assert all(solution[u] != solution[v] for u, v in nx.cycle_graph(5).edges())
@@ -0,0 +1,64 @@
+import networkx as nx
+import pytest
+
+from presolve import dsatur_coloring, MAX_COLORS
+
+
+def assert_valid_coloring(graph, coloring, k):
+    assert set(coloring) == set(graph.nodes())
+    assert all(0 <= c < k for c in coloring.values())
+    assert all(coloring[u] != coloring[v] for u, v in graph.edges())
+
+
+def test_dsatur_colorings_are_valid():
+    for seed in range(10):
+        graph = nx.gnp_random_graph(40, 0.2, seed=seed)
+        k = max(d for _, d in graph.degree()) + 1
+        while k > 0:
+            coloring = dsatur_coloring(graph, k)
+            if coloring is None:
+                break
+            assert_valid_coloring(graph, coloring, k)
+            k -= 1
+        # A clique of the graph needs as many colors as its size.
+        assert k + 1 >= max(len(c) for c in nx.find_cliques(graph))
+
+
+def test_dsatur_colors_bipartite_and_odd_cycles():
+    assert_valid_coloring(nx.cycle_graph(6), dsatur_coloring(nx.cycle_graph(6), 2), 2)
+    assert dsatur_coloring(nx.cycle_graph(5), 2) is None
+    assert_valid_coloring(nx.cycle_graph(5), dsatur_coloring(nx.cycle_graph(5), 3), 3)
+
+
+def test_dsatur_gives_up_without_enough_colors():
+    assert dsatur_coloring(nx.complete_graph(5), 4) is None
+    assert dsatur_coloring(nx.complete_graph(5), 0) is None
+    assert dsatur_coloring(nx.empty_graph(3), MAX_COLORS + 1) is None
+
+
+def test_dsatur_uses_all_max_colors():
+    graph = nx.complete_graph(MAX_COLORS)
+    assert_valid_coloring(graph, dsatur_coloring(graph, MAX_COLORS), MAX_COLORS)
+    assert dsatur_coloring(graph, MAX_COLORS - 1) is None
+
+
+def test_numba_kernel_matches_the_python_kernel():
+    pytest.importorskip("numba")
+    import numpy as np
+    import presolve
+
+    graph = nx.convert_node_labels_to_integers(nx.gnp_random_graph(60, 0.3, seed=1))
+    n = graph.number_of_nodes()
+    indptr = [0]
+    indices = []
+    for v in range(n):
+        indices.extend(graph.adj[v])
+        indptr.append(len(indices))
+
+    for k in (MAX_COLORS, 8, 3):
+        colors = np.full(n, -1, dtype=np.int64)
+        colored = presolve._dsatur_kernel(n, np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64),
+                                          k, colors, np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64))
+        expected = [-1] * n
+        assert colored == presolve._dsatur(n, indptr, indices, k, expected, [0] * n, [0] * n)
+        assert list(colors) == expected
@@ -0,0 +1,92 @@
+import networkx as nx
+import pytest
+from pysmt.shortcuts import reset_env
+
+from reduction import create_reduction, check_reduction, SOLVER_THEORY_MAP
+
+
+def test_released_cvc5_solver_is_reused():
+    pytest.importorskip("cvc5")
+    import GraphEncCVC5
+
+    first = create_reduction("cvc5", "LIA", 3, nx.complete_graph(4), skip_smt=False, reuse_solver=True)
+    assert not first.solve()
+    solver = first.solver
+    first.release()
+    assert solver in [s for s, _ in GraphEncCVC5.SOLVER_POOL.values()]
+
+    # The formula of the first encoding was popped, the next one is solved on its own.
+    second = create_reduction("cvc5", "LIA", 3, nx.cycle_graph(5), skip_smt=False, reuse_solver=True)
+    assert second.solver is solver
+    assert second.solve()
+    second.release()
+
+
+def test_pooled_solver_reuses_the_color_constraints_of_a_graph():
+    pytest.importorskip("cvc5")
+
+    graph = nx.cycle_graph(5)
+    first = create_reduction("cvc5", "LIA", 3, graph, skip_smt=False, reuse_solver=True)
+    assert first.solve()
+    constraints = list(first.colorer.color_constraints)
+    first.release()
+
+    second = create_reduction("cvc5", "LIA", 3, graph, skip_smt=False, reuse_solver=True)
+    assert second.solver is first.solver
+    assert second.solve()
+    assert second.colorer.color_constraints == constraints
+    solution = second.get_solution()
+    assert all(str(solution[u]) != str(solution[v]) for u, v in graph.edges())
+    second.release()
+
+
+def test_colorers_of_a_pooled_solver_share_its_sorts():
+    pytest.importorskip("cvc5")
+
+    first = create_reduction("cvc5", "ABV", 4, nx.cycle_graph(4), skip_smt=False, reuse_solver=True)
+    first.release()
+    second = create_reduction("cvc5", "ABV", 4, nx.path_graph(3), skip_smt=False, reuse_solver=True)
+    assert second.solver is first.solver
+    assert second.colorer.bv_sort is first.colorer.bv_sort
+    assert second.colorer.int_sort is first.colorer.int_sort
+    second.release()
+
+
+def solve(solver, theory, k, graph):
+    reset_env()
+    graph_enc = create_reduction(solver, theory, k, graph, skip_smt=False)
+    result = graph_enc.solve()
+    return result, graph_enc.get_solution() if result else None
+
+
+def assert_valid_coloring(graph, coloring, k):
+    assert set(coloring) == set(graph.nodes())
+    assert len(set(coloring.values())) <= k
+    assert all(coloring[u] != coloring[v] for u, v in graph.edges())
+
+
+# PNLA takes about a minute on the wheel, it is left out.
+@pytest.mark.parametrize("theory", sorted((SOLVER_THEORY_MAP["z3"] | SOLVER_THEORY_MAP["cvc5"]) - {"PNLA"}))
+def test_solution_of_every_encoding(theory):
+    # 4-chromatic, with an isolated node.
+    graph = nx.wheel_graph(6)
+    graph.add_node("isolated")
+
+    for solver in ("z3", "cvc5"):
+        if theory not in SOLVER_THEORY_MAP[solver]:
+            continue
+        if solver == "cvc5":
+            pytest.importorskip("cvc5")
+        result, solution = solve(solver, theory, 4, graph)
+        assert result
+        assert_valid_coloring(graph, solution, 4)
+
+        assert solve(solver, theory, 4, nx.complete_graph(5)) == (False, None)
+
+
+def test_check_reduction():
+    check_reduction("z3", "LIA", 3)
+    with pytest.raises(NotImplementedError):
+        check_reduction("btor", "LIA", 3)
+    with pytest.raises(Exception, match="power of 2"):
+        check_reduction("z3", "BV", 3)